@@ -0,0 +1,150 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Balance Tournament Module
+
+This module runs every character class at every level against every enemy
+type and reports win rates and turns-to-kill, spreading the grid across
+worker processes.
+"""
+
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import character_manager
+import combat_system
+import progression
+
+# Columns of each result row (and of the CSV report)
+RESULT_FIELDS = (
+    "class", "level", "enemy", "winner", "turns",
+    "turns_to_kill", "turns_to_die", "character_health", "enemy_health"
+)
+
+# ============================================================================
+# GRID
+# ============================================================================
+
+def build_grid(classes=None, levels=range(1, 51), enemy_types=None):
+    """
+    Returns: List of (class, level, enemy_type) matchups, grouped by
+             class and level so a chunk reuses each levelled character
+    """
+    classes = list(character_manager.CLASS_BASE_STATS) if classes is None else list(classes)
+    enemy_types = combat_system.get_enemy_types() if enemy_types is None else list(enemy_types)
+    return [
+        (character_class, level, enemy_type)
+        for character_class in classes
+        for level in levels
+        for enemy_type in enemy_types
+    ]
+
+def create_levelled_character(character_class, level):
+    """Create a character and level it through gain_experience"""
+    character = character_manager.create_character(f"{character_class}{level}", character_class)
+    character_manager.gain_experience(character, progression.DEFAULT_PROGRESSION.threshold(level))
+    return character
+
+def _run_chunk(matchups):
+    """
+    Resolve a chunk of matchups (runs in a worker process).
+    Returns: List of result rows
+    """
+    characters = {}
+    rows = []
+    for character_class, level, enemy_type in matchups:
+        key = (character_class, level)
+        if key not in characters:
+            characters[key] = create_levelled_character(character_class, level)
+        character = characters[key]
+        enemy = combat_system.create_enemy(enemy_type)
+
+        outcome = combat_system.resolve_battle(character, enemy)
+        rows.append({
+            "class": character_class,
+            "level": level,
+            "enemy": enemy_type,
+            "winner": outcome["winner"],
+            "turns": outcome["turns"],
+            "turns_to_kill": combat_system.hits_to_kill(character, enemy),
+            "turns_to_die": combat_system.hits_to_kill(enemy, character),
+            "character_health": outcome["character_health"],
+            "enemy_health": outcome["enemy_health"]
+        })
+    return rows
+
+def _chunk(items, chunk_size):
+    return [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def run_tournament(grid=None, max_workers=None, chunk_size=None):
+    """
+    Resolve every matchup in grid (default: build_grid()).
+    Chunks are spread across a ProcessPoolExecutor; with max_workers <= 1
+    everything runs in this process. The default chunk size gives each
+    worker about four chunks so uneven chunks still balance out.
+    Returns: List of result rows, in grid order
+    """
+    grid = build_grid() if grid is None else list(grid)
+    if not grid:
+        return []
+
+    workers = max_workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(grid) // (workers * 4)))
+    chunks = _chunk(grid, chunk_size)
+
+    if workers <= 1:
+        chunk_rows = map(_run_chunk, chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunk_rows = list(pool.map(_run_chunk, chunks))
+    return [row for rows in chunk_rows for row in rows]
+
+def summarize_results(rows):
+    """
+    Aggregate result rows per class and enemy type.
+    Returns: {class: {enemy: {'battles', 'win_rate', 'mean_turns_to_kill',
+              'first_winning_level'}}}
+    """
+    summary = {}
+    for row in rows:
+        stats = summary.setdefault(row["class"], {}).setdefault(row["enemy"], {
+            "battles": 0, "wins": 0, "turns_to_kill": 0, "first_winning_level": None
+        })
+        stats["battles"] += 1
+        stats["turns_to_kill"] += row["turns_to_kill"]
+        if row["winner"] == "player":
+            stats["wins"] += 1
+            if stats["first_winning_level"] is None or row["level"] < stats["first_winning_level"]:
+                stats["first_winning_level"] = row["level"]
+
+    for by_enemy in summary.values():
+        for enemy_type, stats in by_enemy.items():
+            by_enemy[enemy_type] = {
+                "battles": stats["battles"],
+                "win_rate": round(stats["wins"] / stats["battles"], 4),
+                "mean_turns_to_kill": round(stats["turns_to_kill"] / stats["battles"], 2),
+                "first_winning_level": stats["first_winning_level"]
+            }
+    return summary
+
+# ============================================================================
+# REPORTS
+# ============================================================================
+
+def write_csv_report(rows, filename):
+    """Write one line per matchup"""
+    with open(filename, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def write_json_report(rows, filename):
+    """Write the per-class/enemy summary followed by every matchup"""
+    with open(filename, "w") as f:
+        json.dump({"summary": summarize_results(rows), "results": rows}, f, indent=2)
@@ -0,0 +1,77 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark - Batch Battle Simulation
+
+Compares resolving many (character, enemy) matchups one SimpleBattle at a
+time with resolve_battle and with the batch simulate_battles API
+(pure Python and NumPy).
+
+Usage: python benchmarks/bench_battle_simulation.py [--battles N] [--loop-battles N]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import combat_system
+
+def build_matchups(count, seed=0):
+    rng = random.Random(seed)
+    return (
+        [rng.randint(5, 120) for _ in range(count)],
+        [rng.randint(50, 1000) for _ in range(count)],
+        [rng.randint(5, 60) for _ in range(count)],
+        [rng.randint(30, 600) for _ in range(count)],
+    )
+
+def run_simple_battles(columns):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for strength, health, enemy_strength, enemy_health in zip(*columns):
+            character = {"name": "Hero", "health": health, "strength": strength}
+            enemy = {"name": "Foe", "health": enemy_health, "strength": enemy_strength}
+            combat_system.SimpleBattle(character, enemy).start_battle()
+
+def run_resolver(columns):
+    for strength, health, enemy_strength, enemy_health in zip(*columns):
+        combat_system.resolve_battle({"health": health, "strength": strength},
+                                     {"health": enemy_health, "strength": enemy_strength})
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch battle simulation")
+    parser.add_argument("--battles", type=int, default=1000000)
+    parser.add_argument("--loop-battles", type=int, default=20000,
+                        help="battles for the (slow) SimpleBattle loop; scaled up for comparison")
+    args = parser.parse_args()
+
+    columns = build_matchups(args.battles)
+    loop_columns = tuple(column[:args.loop_battles] for column in columns)
+    print(f"{args.battles:,} battles (SimpleBattle loop timed on {args.loop_battles:,} and scaled)")
+
+    results = [
+        ("SimpleBattle", timed(run_simple_battles, loop_columns) * args.battles / args.loop_battles),
+        ("resolve_battle", timed(run_resolver, columns)),
+        ("batch/python", timed(combat_system.simulate_battles, *columns, use_numpy=False)),
+    ]
+    if combat_system.np is not None:
+        arrays = [combat_system.np.asarray(column) for column in columns]
+        results.append(("batch/numpy", timed(combat_system.simulate_battles, *arrays, use_numpy=True)))
+    else:
+        print("  (NumPy not installed - skipping the vectorized run)")
+
+    baseline = results[0][1]
+    for label, seconds in results:
+        print(f"  {label:<16} {seconds:>9.3f}s  {args.battles / seconds:>14,.0f} battles/s  "
+              f"{baseline / seconds:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
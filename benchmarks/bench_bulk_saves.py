@@ -0,0 +1,75 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark - Bulk Character Load/Save
+
+Compares saving and loading many characters one at a time with the
+thread-pooled save_characters/load_characters batch APIs.
+
+Usage: python benchmarks/bench_bulk_saves.py [--characters N] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+
+def build_characters(count):
+    characters = []
+    for i in range(count):
+        character = character_manager.create_character(f"Hero{i:06d}", CLASSES[i % len(CLASSES)])
+        character['inventory'] = [f"item_{j:03d}" for j in range(i % 40)]
+        characters.append(character)
+    return characters
+
+def run_sequential(characters, save_dir):
+    start = time.perf_counter()
+    for character in characters:
+        character_manager.save_character(character, save_dir, force=True)
+    save_seconds = time.perf_counter() - start
+
+    character_manager.clear_character_cache()
+    start = time.perf_counter()
+    for character in characters:
+        character_manager.load_character(character['name'], save_dir)
+    return save_seconds, time.perf_counter() - start
+
+def run_bulk(characters, save_dir, workers):
+    start = time.perf_counter()
+    character_manager.save_characters(characters, save_dir, max_workers=workers, force=True)
+    save_seconds = time.perf_counter() - start
+
+    character_manager.clear_character_cache()
+    start = time.perf_counter()
+    character_manager.load_characters([c['name'] for c in characters], save_dir, max_workers=workers)
+    return save_seconds, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk character load/save")
+    parser.add_argument("--characters", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=character_manager.BULK_MAX_WORKERS)
+    args = parser.parse_args()
+
+    characters = build_characters(args.characters)
+    print(f"{args.characters:,} characters, {args.workers} workers (os.cpu_count()={os.cpu_count()})")
+    print(f"  {'mode':<12} {'save':>10} {'load':>10}")
+
+    results = {}
+    for label, runner in (("sequential", lambda d: run_sequential(characters, d)),
+                          ("bulk", lambda d: run_bulk(characters, d, args.workers))):
+        with tempfile.TemporaryDirectory() as save_dir:
+            results[label] = runner(save_dir)
+        save_seconds, load_seconds = results[label]
+        print(f"  {label:<12} {save_seconds:>9.2f}s {load_seconds:>9.2f}s")
+
+    sequential, bulk = results["sequential"], results["bulk"]
+    print(f"  speedup      {sequential[0] / bulk[0]:>9.1f}x {sequential[1] / bulk[1]:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark - Compact Record Memory
+
+Compares the memory held by loaded quests/items stored as plain dicts with
+the same data stored as compact QuestRecord/ItemRecord objects.
+
+Usage: python benchmarks/bench_compact_records.py [--records N]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+
+def measure_resident(load_func, *args, **kwargs):
+    """
+    Returns: (bytes still allocated by the loaded result, load seconds)
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load_func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compact record memory")
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        quests_file, items_file = game_data.generate_synthetic_data_files(
+            args.records, args.records, directory
+        )
+        print(f"{args.records:,} records per file")
+        print(f"  {'data':<8} {'format':<8} {'resident':>12} {'per record':>12} {'load (traced)':>14}")
+
+        for label, load_func, filename in (("quests", game_data.load_quests, quests_file),
+                                           ("items", game_data.load_items, items_file)):
+            baseline = None
+            for compact in (False, True):
+                resident, seconds = measure_resident(load_func, filename, use_cache=False, compact=compact)
+                baseline = baseline or resident
+                print(f"  {label:<8} {'compact' if compact else 'dict':<8} "
+                      f"{resident / 1048576:>9.1f} MiB {resident / args.records:>10.0f} B "
+                      f"{seconds:>7.2f}s  ({resident / baseline:.0%} of dict)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark - Data Loading Suite
+
+Generates synthetic quests.txt/items.txt files at several sizes and times
+load_quests/load_items (cold and cached), validation and ID lookups.
+Reports throughput and peak traced memory for each step.
+
+Usage: python benchmarks/bench_data_loading.py [--sizes 1000 100000 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+
+LOOKUP_COUNT = 100000
+
+def measure(func, *args, **kwargs):
+    """
+    Run func twice: once for wall time, once under tracemalloc for peak memory.
+    Returns: (result, seconds, peak_bytes)
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    result = func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def validate_all(records, validate):
+    for record in records.values():
+        validate(record)
+    return len(records)
+
+def lookup_all(records, keys):
+    found = 0
+    for key in keys:
+        if records.get(key) is not None:
+            found += 1
+    return found
+
+def report(label, count, seconds, peak):
+    print(f"  {label:<22} {seconds:>8.3f}s {count / seconds:>14,.0f}/s {peak / 1048576:>10.1f} MiB")
+
+def run_size(directory, size):
+    quests_file, items_file = game_data.generate_synthetic_data_files(size, size, directory, seed=size)
+    file_mib = (os.path.getsize(quests_file) + os.path.getsize(items_file)) / 1048576
+    print(f"\n{size:,} quests + {size:,} items ({file_mib:.1f} MiB on disk)")
+    print(f"  {'step':<22} {'time':>9} {'throughput':>16} {'peak mem':>14}")
+
+    quests, seconds, peak = measure(game_data.load_quests, quests_file, use_cache=False)
+    report("load_quests (parse)", size, seconds, peak)
+    items, seconds, peak = measure(game_data.load_items, items_file, use_cache=False)
+    report("load_items (parse)", size, seconds, peak)
+
+    # Build the cache sidecars, then time loading through them
+    game_data.load_quests(quests_file)
+    game_data.load_items(items_file)
+    _, seconds, peak = measure(game_data.load_quests, quests_file)
+    report("load_quests (cached)", size, seconds, peak)
+    _, seconds, peak = measure(game_data.load_items, items_file)
+    report("load_items (cached)", size, seconds, peak)
+
+    _, seconds, peak = measure(validate_all, quests, game_data.validate_quest_data)
+    report("validate_quest_data", size, seconds, peak)
+    _, seconds, peak = measure(validate_all, items, game_data.validate_item_data)
+    report("validate_item_data", size, seconds, peak)
+
+    rng = random.Random(size)
+    keys = [f"item_{rng.randrange(size * 2)}" for _ in range(LOOKUP_COUNT)]
+    _, seconds, peak = measure(lookup_all, items, keys)
+    report("item lookups (50% hit)", LOOKUP_COUNT, seconds, peak)
+
+    for filename in (quests_file, items_file):
+        game_data.clear_data_cache(filename)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark game data loading")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            run_size(directory, size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark - Save File Formats
+
+Compares file size and save/load latency of each save format for a
+character with a large inventory and quest history.
+
+Usage: python benchmarks/bench_save_formats.py [--inventory N] [--quests N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+def build_character(inventory_size, quest_count):
+    character = character_manager.create_character("BenchHero", "Warrior")
+    character['inventory'] = [f"item_{i % 500:03d}" for i in range(inventory_size)]
+    character['completed_quests'] = [f"quest_{i:05d}" for i in range(quest_count)]
+    character['active_quests'] = [f"quest_{i:05d}" for i in range(quest_count, quest_count + 20)]
+    character['experience'] = 123456
+    character['gold'] = 987654
+    return character
+
+def time_format(character, save_dir, save_format, repeat):
+    """
+    Returns: (file size in bytes, mean save seconds, mean load seconds)
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        character_manager.save_character(character, save_dir, force=True, save_format=save_format)
+    save_seconds = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        # Measure the file read, not the in-process load cache
+        character_manager.clear_character_cache()
+        character_manager.load_character(character['name'], save_dir)
+    load_seconds = (time.perf_counter() - start) / repeat
+
+    size = os.path.getsize(os.path.join(save_dir, f"{character['name']}_save.json"))
+    return size, save_seconds, load_seconds
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark save file formats")
+    parser.add_argument("--inventory", type=int, default=5000)
+    parser.add_argument("--quests", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    character = build_character(args.inventory, args.quests)
+    print(f"{args.inventory:,} inventory items, {args.quests:,} completed quests")
+    print(f"  {'format':<8} {'size':>10} {'save':>10} {'load':>10}")
+
+    with tempfile.TemporaryDirectory() as save_dir:
+        baseline = None
+        for save_format in character_manager.SAVE_FORMATS:
+            size, save_seconds, load_seconds = time_format(character, save_dir, save_format, args.repeat)
+            baseline = baseline or size
+            print(f"  {save_format:<8} {size / 1024:>7.1f} KiB {save_seconds * 1000:>7.2f} ms "
+                  f"{load_seconds * 1000:>7.2f} ms  ({size / baseline:.0%} of json)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark - Record Schema Parsing
+
+Compares the compiled single-pass RecordSchema loader with the previous
+parse-then-validate implementation on a large synthetic items file.
+
+Usage: python benchmarks/bench_schema_parsing.py [--items N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from custom_exceptions import InvalidDataFormatError
+
+# ============================================================================
+# PREVIOUS IMPLEMENTATION (for comparison)
+# ============================================================================
+
+def legacy_parse_item_block(lines):
+    item = {}
+    mapping = {
+        'ITEM_ID': 'item_id', 'NAME': 'name', 'TYPE': 'type',
+        'EFFECT': 'effect', 'COST': 'cost', 'DESCRIPTION': 'description'
+    }
+    try:
+        for line in lines:
+            key, value = line.split(': ', 1)
+            internal_key = mapping.get(key.strip())
+            if not internal_key:
+                continue
+            if internal_key == 'cost':
+                value = int(value.strip())
+            else:
+                value = value.strip()
+            item[internal_key] = value
+    except ValueError as e:
+        raise InvalidDataFormatError(f"Error parsing numeric or key/value pair: {e}")
+    return item
+
+def legacy_validate_item_data(item_dict):
+    required_fields = {
+        'ITEM_ID': 'item_id', 'NAME': 'name', 'TYPE': 'type',
+        'EFFECT': 'effect', 'COST': 'cost', 'DESCRIPTION': 'description'
+    }
+    valid_types = ['weapon', 'armor', 'consumable']
+    for raw_key, field in required_fields.items():
+        if field not in item_dict:
+            raise InvalidDataFormatError(f"Item is missing required field: {raw_key}")
+        value = item_dict[field]
+        if field == 'type' and value not in valid_types:
+            raise InvalidDataFormatError(f"Item type '{value}' is invalid.")
+        if field == 'cost' and (not isinstance(value, int) or value < 0):
+            raise InvalidDataFormatError("Item cost must be a non-negative integer.")
+    return True
+
+def legacy_load_block(lines):
+    item = legacy_parse_item_block(lines)
+    legacy_validate_item_data(item)
+    return item
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def time_blocks(blocks, load_block):
+    start = time.perf_counter()
+    for lines in blocks:
+        load_block(lines)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark record schema parsing")
+    parser.add_argument("--items", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "items.txt")
+        game_data.write_synthetic_items(filename, args.items)
+        # Read the blocks up front so only parsing and validation are timed
+        blocks = list(game_data._iter_data_blocks(filename))
+
+        legacy = min(time_blocks(blocks, legacy_load_block) for _ in range(args.repeat))
+        compiled = min(time_blocks(blocks, game_data.ITEM_SCHEMA.load_block) for _ in range(args.repeat))
+
+        start = time.perf_counter()
+        game_data.load_items(filename, use_cache=False)
+        full_load = time.perf_counter() - start
+
+    print(f"{args.items} item blocks (best of {args.repeat})")
+    print(f"  parse + validate (previous): {legacy:.3f}s  {args.items / legacy:,.0f} blocks/s")
+    print(f"  compiled schema (current):   {compiled:.3f}s  {args.items / compiled:,.0f} blocks/s")
+    print(f"  speedup: {legacy / compiled:.2f}x")
+    print(f"  full load_items incl. file reading: {full_load:.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark - Sharded Data Loading
+
+Times game_data.load_item_shards over a directory of synthetic item shards
+with an increasing number of worker processes.
+
+Usage: python benchmarks/bench_shard_loading.py [--items N] [--shards N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+
+def write_item_shards(directory, item_count, shard_count):
+    """Write item_count synthetic items spread evenly over shard_count shard files"""
+    per_shard = (item_count + shard_count - 1) // shard_count
+    for shard in range(shard_count):
+        first = shard * per_shard
+        count = max(0, min(item_count, first + per_shard) - first)
+        path = os.path.join(directory, f"shard_{shard:04d}.txt")
+        game_data.write_synthetic_items(path, count, seed=shard, start_index=first)
+
+def time_load(directory, workers):
+    start = time.perf_counter()
+    items = game_data.load_item_shards(directory, max_workers=workers, use_cache=False)
+    return time.perf_counter() - start, len(items)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sharded item loading")
+    parser.add_argument("--items", type=int, default=200000)
+    parser.add_argument("--shards", type=int, default=32)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, 16, cores} & set(range(1, cores + 1)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_item_shards(directory, args.items, args.shards)
+        print(f"{args.items} items in {args.shards} shards, {cores} cores available")
+        print(f"{'workers':>8} {'seconds':>9} {'items/s':>12} {'speedup':>8}")
+
+        baseline = None
+        for workers in worker_counts:
+            elapsed, count = time_load(directory, workers)
+            if baseline is None:
+                baseline = elapsed
+            print(f"{workers:>8} {elapsed:>9.3f} {count / elapsed:>12.0f} {baseline / elapsed:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
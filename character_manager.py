@@ -11,29 +11,575 @@ This module handles character creation, loading, and saving.
 
 import os
 import json
+import lzma
+import zlib
+import struct
+import hashlib
+import sqlite3
+import stat
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import progression
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
     SaveFileCorruptedError,
     InvalidSaveDataError,
-    CharacterDeadError,
-    InsufficientResourcesError
+    InsufficientResourcesError,
+    GameError
 )
 
-def _get_save_path(character_name, save_directory):
+def _get_save_path(character_name, save_directory, manifest):
+    """
+    manifest is _get_manifest(save_directory), looked up once by the caller
+    (None for flat directories and SQLite databases)
+    """
+    if manifest is not None:
+        shard = _get_shard_name(character_name)
+        return os.path.join(save_directory, shard, f"{character_name}_save.json")
     return os.path.join(save_directory, f"{character_name}_save.json")
 
+# (content hash, file stamp) of the last data written to each save file (by
+# absolute path), so saving an unchanged character can skip validation and
+# disk I/O. The stamp catches files changed or deleted outside this module.
+_saved_fingerprints = {}
+
+def _forget_saved_state(file_path):
+    _saved_fingerprints.pop(os.path.abspath(file_path), None)
+
+def _forget_saved_states_under(save_directory):
+    prefix = os.path.join(os.path.abspath(save_directory), "")
+    for key in [key for key in _saved_fingerprints if key.startswith(prefix)]:
+        _saved_fingerprints.pop(key, None)
+
+# ============================================================================
+# LOADED CHARACTER CACHE
+# ============================================================================
+
+def _get_file_stamp(stat_result):
+    # Atomic saves replace the file, so the inode changes on every write
+    return (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+
+class CharacterCache:
+    """
+    Bounded LRU cache of loaded characters, keyed by save file path.
+    An entry is only used while the file's mtime, size and inode are
+    unchanged, so edits made by other processes are always picked up.
+    Callers get a copy; the cached character is never handed out.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, file_path):
+        """Return a copy of the cached character, or None on a miss"""
+        key = os.path.abspath(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                try:
+                    stamp = _get_file_stamp(os.stat(file_path))
+                except OSError:
+                    stamp = None
+                if stamp == entry[0]:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _snapshot_character(entry[1])
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, file_path, character, stamp=None):
+        """Cache a copy of character as the current contents of file_path"""
+        if self.max_entries <= 0:
+            return
+        if stamp is None:
+            try:
+                stamp = _get_file_stamp(os.stat(file_path))
+            except OSError:
+                return
+        key = os.path.abspath(file_path)
+        with self._lock:
+            self._entries[key] = (stamp, _snapshot_character(character))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, file_path):
+        with self._lock:
+            self._entries.pop(os.path.abspath(file_path), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+_character_cache = CharacterCache()
+
+def get_character_cache():
+    """Return the cache used by load_character (e.g. to read its counters)"""
+    return _character_cache
+
+def clear_character_cache():
+    _character_cache.clear()
+
+# ============================================================================
+# SAVE FILE FORMATS
+# ============================================================================
+
+# "json" is the original pretty-printed format and "compact" is JSON without
+# whitespace; both are plain JSON files. The other formats start with
+# SAVE_MAGIC followed by a one-byte format code, so load_character can tell
+# them apart from JSON saves written by older versions.
+SAVE_MAGIC = b"QCSAVE"
+SAVE_FORMATS = ("json", "compact", "zlib", "lzma", "binary")
+_FORMAT_CODES = {"zlib": 1, "lzma": 2, "binary": 3}
+
+# Format used by save_character when none is given
+DEFAULT_SAVE_FORMAT = "json"
+
+def _write_varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+def _encode_value(value, out):
+    """
+    Append a tagged binary encoding of a JSON-compatible value to out.
+    Integers are zigzag varints and strings/lists/dicts are length-prefixed.
+    """
+    if value is None:
+        out += b"N"
+    elif value is True:
+        out += b"T"
+    elif value is False:
+        out += b"F"
+    elif isinstance(value, int):
+        out += b"i"
+        _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+    elif isinstance(value, float):
+        out += b"f"
+        out += struct.pack("<d", value)
+    elif isinstance(value, str):
+        raw = value.encode('utf-8')
+        out += b"s"
+        _write_varint(out, len(raw))
+        out += raw
+    elif isinstance(value, (list, tuple)):
+        out += b"l"
+        _write_varint(out, len(value))
+        for item in value:
+            _encode_value(item, out)
+    elif isinstance(value, dict):
+        out += b"d"
+        _write_varint(out, len(value))
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TypeError(f"Binary save keys must be strings, not {type(key).__name__}")
+            _encode_value(key, out)
+            _encode_value(item, out)
+    else:
+        raise TypeError(f"Cannot encode {type(value).__name__} in a binary save")
+
+def _decode_value(data, pos):
+    """Returns: (decoded value, position after it)"""
+    tag = data[pos]
+    pos += 1
+    if tag == 0x73:  # s
+        length, pos = _read_varint(data, pos)
+        end = pos + length
+        if end > len(data):
+            raise ValueError("truncated string")
+        return data[pos:end].decode('utf-8'), end
+    if tag == 0x69:  # i
+        value, pos = _read_varint(data, pos)
+        return (value >> 1) if not value & 1 else -((value + 1) >> 1), pos
+    if tag == 0x6C:  # l
+        count, pos = _read_varint(data, pos)
+        items = []
+        for _ in range(count):
+            item, pos = _decode_value(data, pos)
+            items.append(item)
+        return items, pos
+    if tag == 0x64:  # d
+        count, pos = _read_varint(data, pos)
+        result = {}
+        for _ in range(count):
+            key, pos = _decode_value(data, pos)
+            result[key], pos = _decode_value(data, pos)
+        return result, pos
+    if tag == 0x4E:  # N
+        return None, pos
+    if tag == 0x54:  # T
+        return True, pos
+    if tag == 0x46:  # F
+        return False, pos
+    if tag == 0x66:  # f
+        return struct.unpack_from("<d", data, pos)[0], pos + 8
+    raise ValueError(f"unknown binary save tag {tag:#x}")
+
+def _encode_save(character, save_format):
+    """
+    Returns: (payload used for change detection, bytes written to disk).
+    The payload is taken before compression so unchanged characters are
+    detected without compressing them.
+    """
+    if isinstance(character, Character):
+        character = character.to_dict()
+    if save_format == "json":
+        payload = json.dumps(character, indent=4).encode('utf-8')
+        return payload, payload
+    if save_format == "binary":
+        out = bytearray()
+        _encode_value(character, out)
+        payload = bytes(out)
+        return payload, SAVE_MAGIC + bytes([_FORMAT_CODES["binary"]]) + payload
+
+    payload = json.dumps(character, separators=(',', ':')).encode('utf-8')
+    if save_format == "zlib":
+        return payload, SAVE_MAGIC + bytes([_FORMAT_CODES["zlib"]]) + zlib.compress(payload)
+    if save_format == "lzma":
+        return payload, SAVE_MAGIC + bytes([_FORMAT_CODES["lzma"]]) + lzma.compress(payload)
+    return payload, payload
+
+def _decode_save(raw):
+    """
+    Decode save file bytes in any supported format.
+    Raises: ValueError (or a codec-specific error) if the data is corrupted
+    """
+    if not raw.startswith(SAVE_MAGIC):
+        return json.loads(raw)
+
+    code = raw[len(SAVE_MAGIC)]
+    body = raw[len(SAVE_MAGIC) + 1:]
+    if code == _FORMAT_CODES["zlib"]:
+        return json.loads(zlib.decompress(body))
+    if code == _FORMAT_CODES["lzma"]:
+        return json.loads(lzma.decompress(body))
+    if code == _FORMAT_CODES["binary"]:
+        value, end = _decode_value(body, 0)
+        if end != len(body):
+            raise ValueError("trailing data after binary save")
+        return value
+    raise ValueError(f"unknown save format code {code}")
+
+_DECODE_ERRORS = (ValueError, IndexError, TypeError, struct.error, zlib.error, lzma.LZMAError, RecursionError)
+
+# ============================================================================
+# DURABLE FILE WRITES
+# ============================================================================
+
+def _fsync_directory(directory):
+    """
+    Flush a directory entry (e.g. a rename) to disk.
+    Silently skipped on platforms that cannot open directories.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+class GroupCommitter:
+    """
+    Batches the directory fsyncs of concurrent saves.
+    Each saver renames its file into place and then calls sync(). One thread
+    at a time performs the directory fsync on behalf of every rename that
+    finished before it started; the others wait for that fsync instead of
+    issuing their own.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.commits = 0
+        self.syncs = 0
+        self._condition = threading.Condition()
+        self._requested = 0
+        self._completed = 0
+        self._syncing = False
+
+    def sync(self):
+        with self._condition:
+            self.commits += 1
+            self._requested += 1
+            ticket = self._requested
+
+            while self._completed < ticket:
+                if self._syncing:
+                    self._condition.wait()
+                    continue
+
+                # Become the leader for every commit requested so far
+                self._syncing = True
+                target = self._requested
+                self._condition.release()
+                try:
+                    _fsync_directory(self.directory)
+                finally:
+                    self._condition.acquire()
+                    self._syncing = False
+                    self._condition.notify_all()
+                self.syncs += 1
+                self._completed = target
+
+_group_committers = {}
+_group_committers_lock = threading.Lock()
+
+def get_group_committer(save_directory="data/save_games"):
+    """Return the shared GroupCommitter for a save directory"""
+    directory = os.path.abspath(save_directory)
+    with _group_committers_lock:
+        committer = _group_committers.get(directory)
+        if committer is None:
+            committer = GroupCommitter(directory)
+            _group_committers[directory] = committer
+        return committer
+
+def _get_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+# Mode of newly created save files, as open() would give them. Read once:
+# the umask can only be queried by changing it, which is not thread-safe
+_NEW_FILE_MODE = 0o666 & ~_get_umask()
+
+def _write_file_atomically(file_path, data, group_commit=False):
+    """
+    Write data to a temp file in the same directory, fsync it and rename it
+    over file_path, so a crash leaves either the old or the new file intact.
+    Returns: The file stamp (see _get_file_stamp) of the written file
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    directory = os.path.dirname(file_path) or "."
+    try:
+        mode = stat.S_IMODE(os.stat(file_path).st_mode)
+    except OSError:
+        mode = _NEW_FILE_MODE
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            # mkstemp creates the file as 0600; keep the existing/default mode
+            if hasattr(os, 'fchmod'):
+                os.fchmod(f.fileno(), mode)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            # The rename keeps the inode and mtime, so this is file_path's stamp
+            stamp = _get_file_stamp(os.fstat(f.fileno()))
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    if group_commit:
+        get_group_committer(directory).sync()
+    else:
+        _fsync_directory(directory)
+    return stamp
+
+# ============================================================================
+# CHARACTER TYPE
+# ============================================================================
+
+# Fields every character has, in save file order
+CHARACTER_FIELDS = {
+    "name": str, "class": str, "level": int, "health": int,
+    "max_health": int, "strength": int, "magic": int,
+    "experience": int, "gold": int, "inventory": list,
+    "active_quests": list, "completed_quests": list
+}
+
+# Fields that may be absent (e.g. nothing equipped yet)
+OPTIONAL_CHARACTER_FIELDS = {
+    "equipped_weapon": (str, type(None)), "equipped_armor": (str, type(None)),
+    "equipped_weapon_val": (tuple, list), "equipped_armor_val": (tuple, list),
+    "xp_to_next_level": int
+}
+
+_FIELD_TYPES = {**CHARACTER_FIELDS, **OPTIONAL_CHARACTER_FIELDS}
+
+# Equipped (stat, value) pairs are stored as lists, which is what every save
+# format loads them back as, so a saved character reloads equal to itself
+_PAIR_FIELDS = frozenset(["equipped_weapon_val", "equipped_armor_val"])
+
+# Slot name of each field ("class" is a keyword, so it is stored as character_class)
+_FIELD_SLOTS = {field: "character_class" if field == "class" else field for field in _FIELD_TYPES}
+
+def _type_name(expected_type):
+    if isinstance(expected_type, tuple):
+        return " or ".join(t.__name__ for t in expected_type)
+    return expected_type.__name__
+
+class Character(MutableMapping):
+    """
+    Slotted character with typed fields and dict-style access
+    (character['health'], get, setdefault, in, del), so it can be used
+    anywhere a character dict is. Assigning a value of the wrong type
+    raises InvalidSaveDataError, so a Character is always valid to save.
+    Keys outside the known fields are kept in a small extra dict.
+    """
+
+    __slots__ = tuple(_FIELD_SLOTS.values()) + ("_extra",)
+
+    def __init__(self, **fields):
+        self._extra = None
+        for field in CHARACTER_FIELDS:
+            if field not in fields:
+                raise InvalidSaveDataError(f"Missing required field: '{field}'")
+        for field, value in fields.items():
+            self[field] = value
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a Character from a character dict (e.g. a loaded save file).
+        Raises: InvalidSaveDataError if fields are missing or have wrong types
+        """
+        if data is None:
+            raise InvalidSaveDataError("Character data is None")
+        if not isinstance(data, Mapping):
+            raise InvalidSaveDataError(f"Character data must be an object, got {type(data).__name__}")
+        return cls(**data)
+
+    def to_dict(self):
+        """Return a plain dict in save file order (lists are shared, not copied)"""
+        return dict(self.items())
+
+    def copy(self):
+        """Return a copy whose lists can be changed independently"""
+        clone = Character.__new__(Character)
+        clone._extra = None
+        for field, value in self.items():
+            clone[field] = list(value) if isinstance(value, list) else value
+        return clone
+
+    def __getitem__(self, key):
+        slot = _FIELD_SLOTS.get(key)
+        if slot is not None:
+            try:
+                return getattr(self, slot)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        slot = _FIELD_SLOTS.get(key)
+        if slot is None:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+            return
+        expected_type = _FIELD_TYPES[key]
+        if not isinstance(value, expected_type):
+            raise InvalidSaveDataError(
+                f"Field '{key}' has wrong type: expected {_type_name(expected_type)}, got {type(value).__name__}"
+            )
+        if key in _PAIR_FIELDS and not isinstance(value, list):
+            value = list(value)
+        setattr(self, slot, value)
+
+    def __delitem__(self, key):
+        if key in CHARACTER_FIELDS:
+            raise InvalidSaveDataError(f"Cannot remove required field: '{key}'")
+        slot = _FIELD_SLOTS.get(key)
+        if slot is not None:
+            try:
+                delattr(self, slot)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is None:
+            raise KeyError(key)
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key):
+        slot = _FIELD_SLOTS.get(key)
+        if slot is not None:
+            return hasattr(self, slot)
+        return self._extra is not None and key in self._extra
+
+    def get(self, key, default=None):
+        slot = _FIELD_SLOTS.get(key)
+        if slot is not None:
+            return getattr(self, slot, default)
+        if self._extra is None:
+            return default
+        return self._extra.get(key, default)
+
+    def __iter__(self):
+        for field, slot in _FIELD_SLOTS.items():
+            if hasattr(self, slot):
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"Character({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return (_character_from_dict, (self.to_dict(),))
+
+def _character_from_dict(data):
+    return Character.from_dict(data)
+
+def _as_character(character):
+    if isinstance(character, Character):
+        return character
+    return Character.from_dict(character)
+
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
 # ============================================================================
 
+# Starting stats of each character class
+CLASS_BASE_STATS = {
+    "Warrior": {"health": 120, "strength": 15, "magic": 5},
+    "Mage":    {"health": 80,  "strength": 8,  "magic": 20},
+    "Rogue":   {"health": 90,  "strength": 12, "magic": 10},
+    "Cleric":  {"health": 100, "strength": 10, "magic": 15}
+}
+
 def create_character(name, character_class):
-    class_stats = {
-        "Warrior": {"health": 120, "strength": 15, "magic": 5},
-        "Mage":    {"health": 80,  "strength": 8,  "magic": 20},
-        "Rogue":   {"health": 90,  "strength": 12, "magic": 10},
-        "Cleric":  {"health": 100, "strength": 10, "magic": 15}
-    }
+    class_stats = CLASS_BASE_STATS
 
     # Validate character_class first (case-insensitive)
     formatted_class = character_class.title()
@@ -44,71 +590,159 @@ def create_character(name, character_class):
     base = class_stats[formatted_class]
     
     # All characters start with standard defaults
-    new_character = {
-        "name": name,
-        "class": formatted_class,
-        "level": 1,
-        "health": base["health"],
-        "max_health": base["health"],
-        "strength": base["strength"],
-        "magic": base["magic"],
-        "experience": 0,
-        "gold": 100,
-        "inventory": [],
-        "active_quests": [],
-        "completed_quests": []
-    }
+    new_character = Character(
+        name=name,
+        level=1,
+        health=base["health"],
+        max_health=base["health"],
+        strength=base["strength"],
+        magic=base["magic"],
+        experience=0,
+        gold=100,
+        inventory=[],
+        active_quests=[],
+        completed_quests=[],
+        **{"class": formatted_class}
+    )
     
     return new_character
 
-def save_character(character, save_directory="data/save_games"):
-    if not os.path.exists(save_directory):
-        os.makedirs(save_directory)
+def save_character(character, save_directory="data/save_games", group_commit=False, force=False,
+                   save_format=None):
+    """
+    Save a character atomically (temp file + fsync + rename).
+    save_format is one of SAVE_FORMATS (default: DEFAULT_SAVE_FORMAT);
+    load_character detects the format automatically.
+    If the character is unchanged since it was last saved to this file,
+    validation and disk I/O are skipped (unless force=True).
+    With group_commit=True, concurrent saves to the same directory share one
+    directory fsync instead of paying for one each.
+    Returns: True if the file was written, False if nothing had changed
+    """
+    use_sqlite = is_sqlite_save_path(save_directory)
+    manifest = None if use_sqlite else _get_manifest(save_directory)
+    file_path = _get_save_path(character['name'], save_directory, manifest)
+
+    if save_format is None:
+        save_format = DEFAULT_SAVE_FORMAT
+    if save_format not in SAVE_FORMATS:
+        raise ValueError(f"Unknown save format '{save_format}'. Choose from: {', '.join(SAVE_FORMATS)}")
+    if use_sqlite:
+        # The database stores JSON text
+        save_format = "compact"
+
+    # Serialise first so a bad value cannot leave a partial temp file behind
+    try:
+        payload, data = _encode_save(character, save_format)
+    except (TypeError, ValueError):
+        # Report unsupported values the same way as other invalid data
+        validate_character_data(character)
+        raise
+
+    # For SQLite the (virtual) file path is just the dirty-tracking key
+    fingerprint = hashlib.sha1(save_format.encode('ascii') + payload).digest()
+    fingerprint_key = os.path.abspath(file_path)
+    saved = _saved_fingerprints.get(fingerprint_key)
+    if not force and saved is not None and saved[0] == fingerprint:
+        # Skip only if the stored copy was not deleted or changed elsewhere
+        if use_sqlite:
+            if get_sqlite_store(save_directory).load(character['name']) == data.decode('utf-8'):
+                return False
+        else:
+            try:
+                if _get_file_stamp(os.stat(file_path)) == saved[1]:
+                    return False
+            except OSError:
+                pass
 
-    file_path = _get_save_path(character['name'], save_directory)
-    
     # Validate character data before saving
     validate_character_data(character)
 
-    try:
-        with open(file_path, 'w') as f:
-            json.dump(character, f, indent=4)
-        return True
-    except (IOError, PermissionError) as e:
-        # Re-raise file system errors if necessary
-        raise e
+    stamp = None
+    if use_sqlite:
+        get_sqlite_store(save_directory).save(character, data.decode('utf-8'))
+    else:
+        file_directory = os.path.dirname(file_path)
+        if not os.path.exists(file_directory):
+            os.makedirs(file_directory, exist_ok=True)
+        stamp = _write_file_atomically(file_path, data, group_commit)
+        # load_character returns a Character, so cache hits must too
+        try:
+            _character_cache.put(file_path, _as_character(character), stamp)
+        except InvalidSaveDataError:
+            _character_cache.invalidate(file_path)
+
+        if manifest is not None:
+            manifest.add(character['name'])
+
+    _saved_fingerprints[fingerprint_key] = (fingerprint, stamp)
+    return True
 
 def load_character(character_name, save_directory="data/save_games"):
-    file_path = _get_save_path(character_name, save_directory)
+    if is_sqlite_save_path(save_directory):
+        data = get_sqlite_store(save_directory).load(character_name)
+        if data is None:
+            raise CharacterNotFoundError(f"No save file found for '{character_name}'")
+        try:
+            character_data = json.loads(data)
+        except json.JSONDecodeError:
+            raise SaveFileCorruptedError(f"Save file for '{character_name}' is corrupted or unreadable.")
+    else:
+        manifest = _get_manifest(save_directory)
+        file_path = _get_save_path(character_name, save_directory, manifest)
+        cached = _character_cache.get(file_path)
+        if cached is not None:
+            return cached
+        character_data, stamp = _read_save_file(character_name, file_path, manifest)
+
+    # Validate data format while building the Character → InvalidSaveDataError
+    try:
+        character = Character.from_dict(character_data)
+    except InvalidSaveDataError as e:
+        # Re-raise with context that loading failed due to invalid data
+        raise InvalidSaveDataError(f"Data in save file for '{character_name}' is invalid: {e}")
+
+    if not is_sqlite_save_path(save_directory):
+        _character_cache.put(file_path, character, stamp)
     
-    # Check if file exists → CharacterNotFoundError
-    if not os.path.exists(file_path):
+    return character
+
+def _read_save_file(character_name, file_path, manifest):
+    """
+    Read and parse a save file (manifest as for _get_save_path).
+    Returns: (character data, file stamp taken when the file was opened)
+    """
+    # Sharded layout: the manifest answers "does it exist" without a stat
+    if manifest is not None and not manifest.contains(character_name):
         raise CharacterNotFoundError(f"No save file found for '{character_name}'")
 
-    character_data = None
-    
     try:
         # Try to read file → SaveFileCorruptedError
-        with open(file_path, 'r') as f:
-            character_data = json.load(f) # Fixed variable name here (was character_name)
-    except json.JSONDecodeError as e:
-        raise SaveFileCorruptedError(f"Save file for '{character_name}' is corrupted or unreadable.")
+        with open(file_path, 'rb') as f:
+            stamp = _get_file_stamp(os.fstat(f.fileno()))
+            raw = f.read()
+    except FileNotFoundError:
+        # Missing file → CharacterNotFoundError
+        raise CharacterNotFoundError(f"No save file found for '{character_name}'")
     except IOError as e:
         raise SaveFileCorruptedError(f"Could not read save file: {e}")
 
-    # Validate data format → InvalidSaveDataError
     try:
-        validate_character_data(character_data)
-    except InvalidSaveDataError as e:
-        # Re-raise with context that loading failed due to invalid data
-        raise InvalidSaveDataError(f"Data in save file for '{character_name}' is invalid: {e}")
-    
-    return character_data
+        return _decode_save(raw), stamp
+    except _DECODE_ERRORS:
+        raise SaveFileCorruptedError(f"Save file for '{character_name}' is corrupted or unreadable.")
 
 def get_saved_characters(save_directory="data/save_games"):
     """
     Helper function to list available characters (Matched name to main.py call)
     """
+    if is_sqlite_save_path(save_directory):
+        return get_sqlite_store(save_directory).names()
+
+    manifest = _get_manifest(save_directory)
+    if manifest is not None:
+        return manifest.names()
+
     if not os.path.exists(save_directory):
         return []
 
@@ -118,26 +752,554 @@ def get_saved_characters(save_directory="data/save_games"):
         for filename in files:
             if filename.endswith("_save.json"):
                 # Extract character name by removing '_save.json'
-                name = filename[:-11] # Fixed slice length for "_save.json"
+                name = filename[:-len("_save.json")]
                 character_names.append(name)
         return character_names
     except OSError:
         return []
   
 def delete_character(character_name, save_directory="data/save_games"):
-    file_path = _get_save_path(character_name, save_directory)
+    if is_sqlite_save_path(save_directory):
+        _forget_saved_state(_get_save_path(character_name, save_directory, None))
+        if not get_sqlite_store(save_directory).delete(character_name):
+            raise CharacterNotFoundError(f"Cannot delete: No save file found for '{character_name}'")
+        return True
 
+    manifest = _get_manifest(save_directory)
+    file_path = _get_save_path(character_name, save_directory, manifest)
+    if manifest is not None:
+        if not manifest.contains(character_name):
+            raise CharacterNotFoundError(f"Cannot delete: No save file found for '{character_name}'")
     # Verify file exists before attempting deletion
-    if not os.path.exists(file_path):
+    elif not os.path.exists(file_path):
         raise CharacterNotFoundError(f"Cannot delete: No save file found for '{character_name}'")
     
+    _forget_saved_state(file_path)
+    _character_cache.invalidate(file_path)
     try:
+        if manifest is not None:
+            manifest.remove(character_name)
         os.remove(file_path)
         return True
+    except FileNotFoundError:
+        # Already gone - the manifest entry was the only trace left
+        return True
     except OSError as e:
         print(f"Error deleting file {file_path}: {e}")
         return False
 
+# ============================================================================
+# SHARDED SAVE LAYOUT
+# ============================================================================
+
+# A save directory containing this file uses the sharded layout:
+# <save_directory>/<2 hex chars of sha1(name)>/<name>_save.json
+MANIFEST_FILENAME = "manifest.log"
+
+def _get_shard_name(character_name):
+    return hashlib.sha1(character_name.encode('utf-8')).hexdigest()[:2]
+
+class SaveManifest:
+    """
+    Append-only index of the characters in a sharded save directory.
+    Each line is a JSON ["+", name] or ["-", name] entry. Saves and deletes
+    append one line; readers replay only the bytes added since their last
+    read, so listing characters never scans the shard directories.
+    """
+
+    def __init__(self, save_directory):
+        self.save_directory = save_directory
+        self.path = os.path.join(save_directory, MANIFEST_FILENAME)
+        self._lock = threading.Lock()
+        self._names = {}
+        self._offset = 0
+        self._inode = None
+
+    def _refresh(self):
+        try:
+            f = open(self.path, 'rb')
+        except OSError:
+            self._names = {}
+            self._offset = 0
+            self._inode = None
+            return
+
+        with f:
+            stat_result = os.fstat(f.fileno())
+            if stat_result.st_ino != self._inode or stat_result.st_size < self._offset:
+                # The manifest was rebuilt (renamed over) - replay it from the start
+                self._names = {}
+                self._offset = 0
+                self._inode = stat_result.st_ino
+            if stat_result.st_size == self._offset:
+                return
+            f.seek(self._offset)
+            chunk = f.read(stat_result.st_size - self._offset)
+
+        # Leave a partially written last line for the next refresh
+        end = chunk.rfind(b'\n') + 1
+        for line in chunk[:end].splitlines():
+            try:
+                op, name = json.loads(line)
+            except (ValueError, TypeError):
+                continue
+            if op == "+":
+                self._names[name] = None
+            elif op == "-":
+                self._names.pop(name, None)
+        self._offset += end
+
+    def _append(self, op, name):
+        # The offset is not advanced: the next refresh re-reads this line,
+        # which keeps entries appended by other processes in order
+        with open(self.path, 'a') as f:
+            f.write(json.dumps([op, name]) + "\n")
+
+    def names(self):
+        with self._lock:
+            self._refresh()
+            return list(self._names)
+
+    def contains(self, character_name):
+        with self._lock:
+            self._refresh()
+            return character_name in self._names
+
+    def add(self, character_name):
+        with self._lock:
+            self._refresh()
+            if character_name not in self._names:
+                self._append("+", character_name)
+                self._names[character_name] = None
+
+    def remove(self, character_name):
+        with self._lock:
+            self._refresh()
+            if character_name in self._names:
+                self._append("-", character_name)
+                del self._names[character_name]
+
+    def rebuild(self, character_names):
+        """Atomically replace the manifest with one entry per character"""
+        data = "".join(json.dumps(["+", name]) + "\n" for name in sorted(character_names))
+        with self._lock:
+            _write_file_atomically(self.path, data)
+            self._refresh()
+
+_manifests = {}
+_manifests_lock = threading.Lock()
+
+def _get_manifest(save_directory):
+    """Return the SaveManifest of a sharded save directory, or None if flat"""
+    key = os.path.abspath(save_directory)
+    manifest = _manifests.get(key)
+    if manifest is None:
+        # Flat directories are re-checked every time, since another process
+        # may run enable_sharded_layout on them
+        if not os.path.exists(os.path.join(save_directory, MANIFEST_FILENAME)):
+            return None
+        with _manifests_lock:
+            manifest = _manifests.setdefault(key, SaveManifest(save_directory))
+    return manifest
+
+def _scan_shards(save_directory):
+    """Return the character names found in the shard directories"""
+    names = []
+    for shard in os.listdir(save_directory):
+        shard_path = os.path.join(save_directory, shard)
+        if len(shard) != 2 or not os.path.isdir(shard_path):
+            continue
+        for filename in os.listdir(shard_path):
+            if filename.endswith("_save.json"):
+                names.append(filename[:-len("_save.json")])
+    return names
+
+def enable_sharded_layout(save_directory="data/save_games"):
+    """
+    Switch a save directory to the sharded layout, moving any flat save
+    files into their shard directories and writing the manifest.
+    Returns: Number of save files moved
+    """
+    os.makedirs(save_directory, exist_ok=True)
+    flat_names = [
+        filename[:-len("_save.json")] for filename in os.listdir(save_directory)
+        if filename.endswith("_save.json")
+    ]
+
+    manifest = SaveManifest(save_directory)
+    for name in flat_names:
+        shard_dir = os.path.join(save_directory, _get_shard_name(name))
+        os.makedirs(shard_dir, exist_ok=True)
+        os.replace(os.path.join(save_directory, f"{name}_save.json"),
+                   os.path.join(shard_dir, f"{name}_save.json"))
+        _forget_saved_state(os.path.join(save_directory, f"{name}_save.json"))
+
+    manifest.rebuild(_scan_shards(save_directory))
+    with _manifests_lock:
+        _manifests[os.path.abspath(save_directory)] = manifest
+    return len(flat_names)
+
+def check_save_manifest(save_directory="data/save_games", repair=True):
+    """
+    Compare the manifest of a sharded save directory with the save files
+    on disk and rebuild it if they have drifted apart.
+    Returns: {'missing': names on disk but not in the manifest,
+              'stale': names in the manifest without a save file,
+              'rebuilt': True if the manifest was rewritten}
+    """
+    manifest = _get_manifest(save_directory)
+    if manifest is None:
+        raise ValueError(f"'{save_directory}' does not use the sharded save layout")
+
+    on_disk = set(_scan_shards(save_directory))
+    listed = set(manifest.names())
+    report = {
+        'missing': sorted(on_disk - listed),
+        'stale': sorted(listed - on_disk),
+        'rebuilt': False
+    }
+    if repair and (report['missing'] or report['stale']):
+        manifest.rebuild(on_disk)
+        report['rebuilt'] = True
+    return report
+
+# ============================================================================
+# SQLITE SAVE BACKEND
+# ============================================================================
+
+# A save_directory ending in one of these is treated as a SQLite database
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+class SQLiteSaveStore:
+    """
+    SQLite-backed character storage (WAL mode) used by save_character,
+    load_character, get_saved_characters and delete_character when the
+    save_directory is a database path.
+    Characters are stored as JSON with indexed name, class and level columns.
+    Thread-safe; use batch() to group many saves into one transaction.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS characters ("
+            " name TEXT PRIMARY KEY,"
+            " class TEXT NOT NULL,"
+            " level INTEGER NOT NULL,"
+            " data TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_characters_class_level ON characters (class, level)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_characters_level ON characters (level)")
+
+    @contextmanager
+    def batch(self):
+        """Run every save/delete inside the block as one transaction"""
+        with self._lock:
+            if self._batch_depth == 0:
+                self._conn.execute("BEGIN")
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.execute("ROLLBACK")
+                    # Rolled-back saves must not count as saved
+                    _forget_saved_states_under(self.db_path)
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._conn.execute("COMMIT")
+
+    def save(self, character, data):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO characters (name, class, level, data) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(name) DO UPDATE SET"
+                " class = excluded.class, level = excluded.level, data = excluded.data",
+                (character['name'], character['class'], character['level'], data)
+            )
+
+    def load(self, character_name):
+        """Returns: The stored JSON text, or None if the character does not exist"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM characters WHERE name = ?", (character_name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def delete(self, character_name):
+        """Returns: True if a character was deleted"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM characters WHERE name = ?", (character_name,))
+        return cursor.rowcount > 0
+
+    def names(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT name FROM characters ORDER BY name").fetchall()
+        return [row[0] for row in rows]
+
+    def find(self, character_class=None, min_level=None, max_level=None):
+        """
+        Return character names matching a class and/or level range, using
+        the class/level indexes.
+        """
+        conditions = []
+        params = []
+        if character_class is not None:
+            conditions.append("class = ?")
+            params.append(character_class)
+        if min_level is not None:
+            conditions.append("level >= ?")
+            params.append(min_level)
+        if max_level is not None:
+            conditions.append("level <= ?")
+            params.append(max_level)
+
+        query = "SELECT name FROM characters"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY level DESC, name"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_sqlite_stores = {}
+_sqlite_stores_lock = threading.Lock()
+
+def is_sqlite_save_path(save_directory):
+    return str(save_directory).lower().endswith(SQLITE_SUFFIXES)
+
+def get_sqlite_store(db_path="data/save_games.db"):
+    """Return the shared SQLiteSaveStore for a database path"""
+    key = os.path.abspath(db_path)
+    with _sqlite_stores_lock:
+        store = _sqlite_stores.get(key)
+        if store is None:
+            store = SQLiteSaveStore(db_path)
+            _sqlite_stores[key] = store
+        return store
+
+def close_sqlite_stores():
+    """Close every open SQLite save store"""
+    with _sqlite_stores_lock:
+        for store in _sqlite_stores.values():
+            store.close()
+        _sqlite_stores.clear()
+
+def find_characters(save_directory="data/save_games.db", character_class=None,
+                    min_level=None, max_level=None):
+    """
+    Indexed lookup of saved character names by class and/or level range.
+    Requires the SQLite backend.
+    """
+    if not is_sqlite_save_path(save_directory):
+        raise ValueError("find_characters requires a SQLite save database")
+    return get_sqlite_store(save_directory).find(character_class, min_level, max_level)
+
+def migrate_json_saves(json_directory="data/save_games", db_path="data/save_games.db"):
+    """
+    Import every JSON save file into a SQLite save database in one transaction.
+    Unreadable or invalid saves are skipped and reported.
+    Returns: (list of migrated names, {name: exception} for failures)
+    """
+    store = get_sqlite_store(db_path)
+    migrated = []
+    errors = {}
+    with store.batch():
+        for name in get_saved_characters(json_directory):
+            try:
+                character = load_character(name, json_directory)
+                save_character(character, db_path, force=True)
+                migrated.append(name)
+            except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError) as e:
+                errors[name] = e
+    return migrated, errors
+
+# ============================================================================
+# BULK LOAD AND SAVE
+# ============================================================================
+
+# Default number of I/O threads used by load_characters/save_characters
+BULK_MAX_WORKERS = 8
+
+# Per-character failures that are reported instead of aborting a batch
+_BULK_ERRORS = (GameError, OSError)
+
+def _run_bulk(task, keyed_items, max_workers):
+    """
+    Run task(item) for each (key, item) pair, on a thread pool unless
+    max_workers <= 1.
+    Returns: ({key: result}, {key: exception})
+    """
+    def run(pair):
+        key, item = pair
+        try:
+            return key, task(item), None
+        except _BULK_ERRORS as e:
+            return key, None, e
+
+    if max_workers is not None and max_workers <= 1:
+        outcomes = map(run, keyed_items)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            outcomes = list(pool.map(run, keyed_items))
+
+    results = {}
+    errors = {}
+    for key, result, error in outcomes:
+        if error is None:
+            results[key] = result
+        else:
+            errors[key] = error
+    return results, errors
+
+def load_characters(character_names, save_directory="data/save_games", max_workers=BULK_MAX_WORKERS):
+    """
+    Load many characters, overlapping file I/O on a thread pool.
+    A character that fails to load (CharacterNotFoundError,
+    SaveFileCorruptedError, InvalidSaveDataError, ...) is reported in the
+    errors dict without stopping the rest of the batch.
+    Returns: ({name: character}, {name: exception})
+    """
+    if is_sqlite_save_path(save_directory):
+        # One connection serves every query; threads would only queue on it
+        max_workers = 1
+    return _run_bulk(
+        lambda name: load_character(name, save_directory),
+        [(name, name) for name in character_names],
+        max_workers
+    )
+
+def save_characters(characters, save_directory="data/save_games", max_workers=BULK_MAX_WORKERS,
+                    force=False, save_format=None):
+    """
+    Save many characters, overlapping file I/O on a thread pool. Saves use
+    group commit so the threads share directory fsyncs.
+    Failed saves are reported in the errors dict without stopping the batch.
+    Returns: ({name: True if written / False if unchanged}, {name: exception})
+    """
+    if save_format is not None and save_format not in SAVE_FORMATS:
+        raise ValueError(f"Unknown save format '{save_format}'. Choose from: {', '.join(SAVE_FORMATS)}")
+
+    def save(character):
+        return save_character(character, save_directory, group_commit=True, force=force,
+                              save_format=save_format)
+
+    keyed_characters = [(character['name'], character) for character in characters]
+    if is_sqlite_save_path(save_directory):
+        # Sequential, but committed as a single transaction
+        with get_sqlite_store(save_directory).batch():
+            return _run_bulk(save, keyed_characters, 1)
+    return _run_bulk(save, keyed_characters, max_workers)
+
+# ============================================================================
+# WRITE-BEHIND AUTOSAVE
+# ============================================================================
+
+def _snapshot_character(character):
+    """
+    Copy a character so later in-place edits (e.g. inventory appends) do not
+    change what gets saved. Lists are copied; other values are immutable.
+    """
+    if isinstance(character, Character):
+        return character.copy()
+    return {
+        key: list(value) if isinstance(value, list) else value
+        for key, value in character.items()
+    }
+
+class WriteBehindSaver:
+    """
+    Background saver that takes disk I/O out of the game loop.
+    submit() snapshots a dirty character and returns immediately. A worker
+    thread saves the latest snapshot of each character every `interval`
+    seconds, so repeated submits between saves coalesce into one write.
+    flush() saves everything pending right away (clean exits, death).
+    """
+
+    def __init__(self, save_directory="data/save_games", interval=1.0):
+        self.save_directory = save_directory
+        self.interval = interval
+        self.submits = 0
+        self.saves = 0
+        self._pending = {}
+        self._errors = []
+        self._pending_lock = threading.Lock()
+        # Held while a batch is written so batches reach the disk in order
+        self._save_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="write-behind-saver", daemon=True)
+        self._thread.start()
+
+    def submit(self, character):
+        """Queue a character to be saved; replaces any pending snapshot"""
+        if self._closed:
+            raise RuntimeError("WriteBehindSaver is closed")
+        snapshot = _snapshot_character(character)
+        with self._pending_lock:
+            self._pending[snapshot['name']] = snapshot
+            self.submits += 1
+
+    def pending_count(self):
+        with self._pending_lock:
+            return len(self._pending)
+
+    def flush(self):
+        """
+        Save all pending characters now, in the calling thread.
+        Returns: List of (character_name, exception) for saves that failed
+                 since the last flush (including background saves)
+        """
+        self._save_pending()
+        with self._pending_lock:
+            errors, self._errors = self._errors, []
+        return errors
+
+    def close(self):
+        """Stop the worker thread and flush anything still pending"""
+        if not self._closed:
+            self._closed = True
+            self._wake.set()
+            self._thread.join()
+        return self.flush()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self._save_pending()
+
+    def _save_pending(self):
+        with self._save_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, {}
+
+            for name, snapshot in batch.items():
+                try:
+                    if save_character(snapshot, self.save_directory, group_commit=True):
+                        self.saves += 1
+                except Exception as e:
+                    with self._pending_lock:
+                        self._errors.append((name, e))
+
 # ============================================================================
 # CHARACTER OPERATIONS
 # ============================================================================
@@ -146,28 +1308,11 @@ def is_character_dead(character):
     return character['health'] <= 0
 
 def gain_experience(character, xp_amount):
-    if is_character_dead(character):
-        raise CharacterDeadError(f"{character['name']} is dead and cannot gain experience.")
-
-    # Add experience
-    character['experience'] += xp_amount
-    
-    while True:
-        level_up_xp = character['level'] * 100
-        
-        # Check for level up
-        if character['experience'] >= level_up_xp:
-            # Update stats on level up
-            character['level'] += 1
-            character['experience'] -= level_up_xp
-            character['max_health'] += 10
-            character['strength'] += 2
-            character['magic'] += 2
-            
-            # Restore health to max_health
-            character['health'] = character['max_health']
-        else:
-            break
+    """
+    Add XP and apply any level ups (see progression.ProgressionTable).
+    Raises: CharacterDeadError if the character is dead
+    """
+    progression.apply_experience(character, xp_amount)
 
 def add_gold(character, amount):
     new_gold = character['gold'] + amount
@@ -232,12 +1377,11 @@ def validate_character_data(character):
     if character is None:
         raise InvalidSaveDataError("Character data is None")
 
-    required_fields = {
-        "name": str, "class": str, "level": int, "health": int, 
-        "max_health": int, "strength": int, "magic": int, 
-        "experience": int, "gold": int, "inventory": list,
-        "active_quests": list, "completed_quests": list
-    }
+    # Types were checked when each field was assigned
+    if isinstance(character, Character):
+        return True
+
+    required_fields = CHARACTER_FIELDS
 
     for field, expected_type in required_fields.items():
         # Check all required keys exist
@@ -10,7 +10,19 @@ Handles combat mechanics
 """
 
 import random
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_right
+from collections import deque
+try:
+    import numpy as np
+except ImportError:
+    # simulate_battles falls back to a pure-Python loop without NumPy
+    np = None
+
+import game_data
 from custom_exceptions import (
+    MissingDataFileError,
     InvalidTargetError,
     CombatNotActiveError,
     CharacterDeadError,
@@ -21,35 +33,207 @@ from custom_exceptions import (
 # ENEMY DEFINITIONS
 # ============================================================================
 
+# Data file the enemy registry is loaded from (built-in defaults if missing)
+ENEMIES_FILE = "data/enemies.txt"
+
+# Enemy dict keys and the enemy record field each is copied from
+_ENEMY_FIELDS = (
+    ("name", "name"), ("health", "health"), ("max_health", "health"), ("strength", "strength"),
+    ("magic", "magic"), ("xp_reward", "xp_reward"), ("gold_reward", "gold_reward")
+)
+
+class EnemyRegistry:
+    """
+    Enemy prototypes keyed by lower-case enemy ID, plus a level index.
+    create() shallow-copies a prototype, so creating an enemy does not
+    depend on how many enemy types exist. The level index splits the level
+    axis into segments at every MIN_LEVEL/MAX_LEVEL boundary and stores
+    the enemies spawning in each, so a level lookup is one bisect.
+    """
+
+    def __init__(self, enemies):
+        """enemies: {enemy_id: record} as returned by game_data.load_enemies"""
+        self._prototypes = {}
+        for enemy_id, record in enemies.items():
+            prototype = {key: record[field] for key, field in _ENEMY_FIELDS}
+            self._prototypes[enemy_id.lower()] = prototype
+        self._build_level_index(enemies)
+
+    def _build_level_index(self, enemies):
+        # (level, +1/-1, enemy_id): an enemy starts spawning at min_level
+        # and stops after max_level (0 = no limit)
+        events = []
+        for enemy_id, record in enemies.items():
+            if record["spawns"] != "yes":
+                continue
+            events.append((record["min_level"], 1, enemy_id.lower()))
+            if record["max_level"]:
+                events.append((record["max_level"] + 1, -1, enemy_id.lower()))
+        events.sort(key=lambda event: (event[0], event[1]))
+
+        self._segment_starts = []
+        self._segment_enemies = []
+        active = {}
+        for index, (level, change, enemy_id) in enumerate(events):
+            if change > 0:
+                active[enemy_id] = None
+            else:
+                active.pop(enemy_id, None)
+            if index + 1 < len(events) and events[index + 1][0] == level:
+                continue
+            # A gap with no enemies keeps the enemies of the segment below
+            candidates = tuple(active) or (self._segment_enemies[-1] if self._segment_enemies else ())
+            if self._segment_starts and self._segment_enemies[-1] == candidates:
+                continue
+            self._segment_starts.append(level)
+            self._segment_enemies.append(candidates)
+
+    def create(self, enemy_type):
+        """
+        Returns: A new enemy dict copied from the prototype
+        Raises: InvalidTargetError if the enemy type is unknown
+        """
+        prototype = self._prototypes.get(enemy_type.lower())
+        if prototype is None:
+            raise InvalidTargetError("Unknown enemy type: {}".format(enemy_type))
+        return dict(prototype)
+
+    def enemy_types(self):
+        return list(self._prototypes)
+
+    def enemies_for_level(self, level):
+        """
+        Returns: Tuple of enemy types that spawn at level. Levels below the
+                 first segment use the lowest-level enemies.
+        """
+        if not self._segment_starts:
+            return ()
+        index = max(0, bisect_right(self._segment_starts, level) - 1)
+        return self._segment_enemies[index]
+
+_enemy_registry = None
+
+def load_enemy_registry(filename=ENEMIES_FILE):
+    """
+    Load (or reload) the enemy registry used by create_enemy.
+    Falls back to the built-in enemies if the file does not exist.
+    Returns: The new EnemyRegistry
+    """
+    global _enemy_registry
+    try:
+        enemies = game_data.load_enemies(filename)
+    except MissingDataFileError:
+        enemies = game_data.load_default_enemies()
+    _enemy_registry = EnemyRegistry(enemies)
+    return _enemy_registry
+
+def get_enemy_registry():
+    if _enemy_registry is None:
+        return load_enemy_registry()
+    return _enemy_registry
+
+def get_enemy_types():
+    """Returns: List of enemy types accepted by create_enemy"""
+    return get_enemy_registry().enemy_types()
+
 def create_enemy(enemy_type):
     """
-    Create an enemy based on type.
+    Create an enemy based on type (a copy of its prototype in the registry).
     Note: Names are capitalized to pass test_combat_system_basic_battle
     """
-    et = enemy_type.lower()
-    if et == "goblin":
-        e = {"name": "Goblin", "health": 50, "max_health": 50, "strength": 8, "magic": 2, "xp_reward": 25, "gold_reward": 10}
-    elif et == "orc":
-        e = {"name": "Orc", "health": 80, "max_health": 80, "strength": 12, "magic": 5, "xp_reward": 50, "gold_reward": 25}
-    elif et == "dragon":
-        e = {"name": "Dragon", "health": 200, "max_health": 200, "strength": 25, "magic": 15, "xp_reward": 200, "gold_reward": 100}
-    elif et == "skeleton":
-        e = {"name": "Skeleton", "health": 40, "max_health": 40, "strength": 10, "magic": 0, "xp_reward": 20, "gold_reward": 5}
-    else:
-        raise InvalidTargetError("Unknown enemy type: {}".format(enemy_type))
-    return e
+    return get_enemy_registry().create(enemy_type)
 
 
 def get_random_enemy_for_level(character_level):
     """
     Get an appropriate enemy for character's level.
     """
-    if character_level <= 2:
-        return create_enemy("goblin")
-    elif 3 <= character_level <= 5:
-        return create_enemy("orc")
-    else:
-        return create_enemy("dragon")
+    candidates = get_enemy_registry().enemies_for_level(character_level)
+    if not candidates:
+        raise InvalidTargetError("No enemies are defined for level {}".format(character_level))
+    if len(candidates) == 1:
+        return create_enemy(candidates[0])
+    return create_enemy(random.choice(candidates))
+
+# ============================================================================
+# BATTLE LOG SINKS
+# ============================================================================
+
+# Message templates for each battle log event
+BATTLE_LOG_MESSAGES = {
+    "attack": "{attacker} attacks {target} for {damage} damage",
+    "defeat": "You were defeated by the {enemy}...",
+    "no_winner": "Combat ended without a decisive winner."
+}
+
+class BattleLogSink(ABC):
+    """
+    Destination for battle log events. Events are passed as an event name
+    plus fields and only formatted by sinks that need text; callers skip
+    building the fields entirely when `enabled` is False.
+    Subclasses must implement log().
+    """
+
+    enabled = True
+
+    @abstractmethod
+    def log(self, event, **fields):
+        """Record one event"""
+
+    @staticmethod
+    def format(event, fields):
+        return BATTLE_LOG_MESSAGES[event].format(**fields)
+
+class StdoutSink(BattleLogSink):
+    """Print every message (the default)"""
+
+    def log(self, event, **fields):
+        display_battle_log(self.format(event, fields))
+
+class NullSink(BattleLogSink):
+    """Discard everything; battles using it take the resolve_battle fast path"""
+
+    enabled = False
+
+    def log(self, event, **fields):
+        pass
+
+class RingBufferSink(BattleLogSink):
+    """Keep the last `capacity` formatted messages"""
+
+    def __init__(self, capacity=100):
+        self.messages = deque(maxlen=capacity)
+
+    def log(self, event, **fields):
+        self.messages.append(self.format(event, fields))
+
+class EventListSink(BattleLogSink):
+    """Record events as dicts ({'event': name, **fields}) without formatting"""
+
+    def __init__(self):
+        self.events = []
+
+    def log(self, event, **fields):
+        fields["event"] = event
+        self.events.append(fields)
+
+    def messages(self):
+        """Returns: The recorded events formatted as log messages"""
+        return [
+            self.format(event["event"], {k: v for k, v in event.items() if k != "event"})
+            for event in self.events
+        ]
+
+STDOUT_SINK = StdoutSink()
+NULL_SINK = NullSink()
+
+def _get_log_sink(log):
+    """Map SimpleBattle's log argument (bool or sink) to a sink"""
+    if log is True:
+        return STDOUT_SINK
+    if log is False or log is None:
+        return NULL_SINK
+    return log
 
 # ============================================================================
 # COMBAT SYSTEM
@@ -60,10 +244,16 @@ class SimpleBattle:
     Simple turn-based combat system.
     """
 
-    def __init__(self, character, enemy):
-        """Initialize battle with character and enemy"""
+    def __init__(self, character, enemy, log=True):
+        """
+        Initialize battle with character and enemy.
+        log is True (print to stdout), False, or a BattleLogSink. With
+        log=False (or any disabled sink) the battle is resolved in one step
+        by resolve_battle.
+        """
         self.character = character
         self.enemy = enemy
+        self.log_sink = _get_log_sink(log)
         self.combat_active = True
         self.turns = 0
 
@@ -74,6 +264,9 @@ class SimpleBattle:
         if int(self.character.get("health", 0)) <= 0:
             raise CharacterDeadError("Character is dead and cannot enter battle")
 
+        if not self.log_sink.enabled:
+            return self._resolve_without_log()
+
         # loop until someone dies or combat is flagged inactive (escape)
         result = None
         while True:
@@ -106,12 +299,23 @@ class SimpleBattle:
         if result == "player":
             return "VICTORY"
         elif result == "enemy":
-            display_battle_log("You were defeated by the {}...".format(self.enemy.get("name", "enemy")))
+            if self.log_sink.enabled:
+                self.log_sink.log("defeat", enemy=self.enemy.get("name", "enemy"))
             return "DEFEAT"
         else:
-            display_battle_log("Combat ended without a decisive winner.")
+            if self.log_sink.enabled:
+                self.log_sink.log("no_winner")
             return "FLED"
 
+    def _resolve_without_log(self):
+        """Fast path for start_battle: same result, no turn-by-turn loop"""
+        outcome = resolve_battle(self.character, self.enemy)
+        self.turns += outcome["turns"]
+        self.character["health"] = outcome["character_health"]
+        self.enemy["health"] = outcome["enemy_health"]
+        self.combat_active = False
+        return "VICTORY" if outcome["winner"] == "player" else "DEFEAT"
+
     def player_turn(self):
         """
         Handle player's turn - non-interactive basic attack.
@@ -122,7 +326,9 @@ class SimpleBattle:
         # Basic attack uses character 'strength'
         damage = self.calculate_damage(self.character, self.enemy)
         self.apply_damage(self.enemy, damage)
-        display_battle_log("{} attacks {} for {} damage".format(self.character.get("name", "Player"), self.enemy.get("name", "Enemy"), damage))
+        if self.log_sink.enabled:
+            self.log_sink.log("attack", attacker=self.character.get("name", "Player"),
+                              target=self.enemy.get("name", "Enemy"), damage=damage)
         return damage
 
     def enemy_turn(self):
@@ -134,7 +340,9 @@ class SimpleBattle:
 
         damage = self.calculate_damage(self.enemy, self.character)
         self.apply_damage(self.character, damage)
-        display_battle_log("{} attacks {} for {} damage".format(self.enemy.get("name", "Enemy"), self.character.get("name", "Player"), damage))
+        if self.log_sink.enabled:
+            self.log_sink.log("attack", attacker=self.enemy.get("name", "Enemy"),
+                              target=self.character.get("name", "Player"), damage=damage)
         return damage
 
     def calculate_damage(self, attacker, defender):
@@ -169,6 +377,143 @@ class SimpleBattle:
             return "enemy"
         return None
 
+# ============================================================================
+# CLOSED-FORM RESOLUTION
+# ============================================================================
+
+def resolve_battle(character, enemy):
+    """
+    Compute the outcome of SimpleBattle.start_battle without playing it out.
+    Damage per hit is fixed, so each side needs ceil(health / damage) hits
+    to win; the player strikes first, so they win ties.
+    Does not modify character or enemy.
+    Returns: Dictionary with 'winner' ('player' or 'enemy'), 'turns',
+             'character_health' and 'enemy_health' (final values)
+    Raises: CharacterDeadError if the character is already dead
+    """
+    character_health = int(character.get("health", 0))
+    if character_health <= 0:
+        raise CharacterDeadError("Character is dead and cannot enter battle")
+
+    player_won, turns, character_health, enemy_health = _resolve_stats(
+        int(character.get("strength", 0)), character_health,
+        int(enemy.get("strength", 0)), int(enemy.get("health", 0))
+    )
+    return {
+        "winner": "player" if player_won else "enemy",
+        "turns": turns,
+        "character_health": character_health,
+        "enemy_health": enemy_health
+    }
+
+def hits_to_kill(attacker, defender):
+    """
+    Returns: Number of hits attacker needs to bring defender to 0 HP
+             (at least 1), with SimpleBattle's damage formula
+    """
+    return _damage_and_hits(
+        int(attacker.get("strength", 0)), int(defender.get("strength", 0)), int(defender.get("health", 0))
+    )[1]
+
+def _damage_and_hits(attacker_strength, defender_strength, defender_health):
+    """
+    Returns: (damage per hit, hits needed to bring the defender to 0 HP)
+    """
+    damage = max(1, attacker_strength - defender_strength // 4)
+    return damage, max(1, -(-defender_health // damage))
+
+def _resolve_stats(character_strength, character_health, enemy_strength, enemy_health):
+    """
+    Closed-form battle on raw stats (character_health must be > 0).
+    Returns: (player_won, turns, final character health, final enemy health)
+    """
+    # Hits each side needs (the player always gets the first hit)
+    player_damage, player_hits = _damage_and_hits(character_strength, enemy_strength, enemy_health)
+    enemy_damage, enemy_hits = _damage_and_hits(enemy_strength, character_strength, character_health)
+
+    if player_hits <= enemy_hits:
+        return True, player_hits, character_health - (player_hits - 1) * enemy_damage, 0
+    return False, enemy_hits, 0, enemy_health - enemy_hits * player_damage
+
+# ============================================================================
+# BATCH SIMULATION
+# ============================================================================
+
+def _use_numpy(use_numpy):
+    if use_numpy is None:
+        return np is not None
+    if use_numpy and np is None:
+        raise ImportError("NumPy is not installed")
+    return use_numpy
+
+def simulate_battles(character_strength, character_health, enemy_strength, enemy_health, use_numpy=None):
+    """
+    Resolve many battles at once from stat arrays, with the same results as
+    resolve_battle for each position. Scalars are broadcast against arrays
+    (e.g. one enemy type against many characters). A character that starts
+    at 0 HP or less loses in 0 turns and nothing changes.
+    Uses NumPy when available (or use_numpy=True), else a Python loop.
+    Returns: {'player_wins': bools, 'turns', 'character_health',
+              'enemy_health': final values, 'numpy': bool}
+    """
+    if _use_numpy(use_numpy):
+        return _simulate_battles_numpy(character_strength, character_health, enemy_strength, enemy_health)
+
+    columns = [character_strength, character_health, enemy_strength, enemy_health]
+    size = max((len(column) for column in columns if not isinstance(column, int)), default=1)
+    for index, column in enumerate(columns):
+        if isinstance(column, int):
+            columns[index] = [column] * size
+        elif len(column) != size:
+            raise ValueError(f"Stat arrays must have the same length ({len(column)} != {size})")
+
+    player_wins = []
+    turns = array('q')
+    final_character_health = array('q')
+    final_enemy_health = array('q')
+    for stats in zip(*columns):
+        if stats[1] <= 0:
+            outcome = (False, 0, stats[1], stats[3])
+        else:
+            outcome = _resolve_stats(*stats)
+        player_wins.append(outcome[0])
+        turns.append(outcome[1])
+        final_character_health.append(outcome[2])
+        final_enemy_health.append(outcome[3])
+
+    return {
+        "player_wins": player_wins,
+        "turns": turns,
+        "character_health": final_character_health,
+        "enemy_health": final_enemy_health,
+        "numpy": False
+    }
+
+def _simulate_battles_numpy(character_strength, character_health, enemy_strength, enemy_health):
+    character_strength, character_health, enemy_strength, enemy_health = np.broadcast_arrays(
+        *(np.asarray(column, dtype=np.int64)
+          for column in (character_strength, character_health, enemy_strength, enemy_health))
+    )
+
+    player_damage = np.maximum(1, character_strength - enemy_strength // 4)
+    enemy_damage = np.maximum(1, enemy_strength - character_strength // 4)
+    player_hits = np.maximum(1, -(-enemy_health // player_damage))
+    # Dead characters need 0 hits to lose
+    enemy_hits = np.maximum(0, -(-character_health // enemy_damage))
+
+    alive = character_health > 0
+    player_wins = (player_hits <= enemy_hits) & alive
+    return {
+        "player_wins": player_wins,
+        "turns": np.where(player_wins, player_hits, enemy_hits),
+        "character_health": np.where(
+            player_wins, character_health - (player_hits - 1) * enemy_damage,
+            np.where(alive, 0, character_health)
+        ),
+        "enemy_health": np.where(player_wins, 0, enemy_health - enemy_hits * player_damage),
+        "numpy": True
+    }
+
 # ============================================================================
 # COMBAT UTILITIES
 # ============================================================================
@@ -10,112 +10,1169 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import hashlib
+import marshal
+import mmap
+import random
+import re
+import sys
+from array import array
+from bisect import bisect_left, insort
+from collections.abc import Mapping, MutableMapping
+from concurrent.futures import ProcessPoolExecutor
+try:
+    import numpy as np
+except ImportError:
+    # Columnar analytics fall back to array.array without NumPy
+    np = None
+
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+# Compiled cache sidecars live next to each data file (e.g. data/items.txt.cache)
+CACHE_SUFFIX = ".cache"
+CACHE_FORMAT_VERSION = 1
+
+# ============================================================================
+# RECORD SCHEMAS
+# ============================================================================
+
+class RecordSchema:
+    """
+    Declarative description of one record type in a data file.
+
+    fields is a list of (FILE_KEY, field_name, type) tuples where type is str
+    or int (int fields must be non-negative). choices maps a field name to
+    its allowed values. The schema is compiled once into lookup tables so a
+    block is converted and validated in a single pass over its lines.
+    """
+
+    def __init__(self, label, fields, choices=None, int_error=None, plural=None):
+        self.label = label
+        self.plural = plural or label + "s"
+        self.fields = list(fields)
+        self.choices = dict(choices or {})
+        self.id_key, self.id_field = self.fields[0][0], self.fields[0][1]
+        self.int_error = int_error or (label + " field '{field}' must be a non-negative integer.")
+
+        # FILE_KEY -> (field_name, converter), with and without validation
+        self._parse_table = {}
+        self._load_table = {}
+        for raw_key, field, field_type in self.fields:
+            if field_type is int:
+                self._parse_table[raw_key] = (field, int)
+                self._load_table[raw_key] = (field, self._make_int_converter(field))
+            elif field in self.choices:
+                self._parse_table[raw_key] = (field, str)
+                self._load_table[raw_key] = (field, self._make_choice_converter(field))
+            else:
+                self._parse_table[raw_key] = (field, str)
+                self._load_table[raw_key] = (field, str)
+        self._field_count = len(self.fields)
+
+    def _make_int_converter(self, field):
+        message = self.int_error.format(field=field)
+
+        def convert(value):
+            number = int(value)
+            if number < 0:
+                raise InvalidDataFormatError(message)
+            return number
+        return convert
+
+    def _make_choice_converter(self, field):
+        allowed = self.choices[field]
+        allowed_set = frozenset(allowed)
+
+        def convert(value):
+            if value not in allowed_set:
+                raise InvalidDataFormatError(self._choice_error(field, value))
+            return value
+        return convert
+
+    def _choice_error(self, field, value):
+        return f"{self.label} {field} '{value}' is invalid. Must be one of: {', '.join(self.choices[field])}"
+
+    def _convert_lines(self, lines, table):
+        record = {}
+        try:
+            for line in lines:
+                key, value = line.split(': ', 1)
+                entry = table.get(key.strip())
+                if entry is None:
+                    # Ignore unknown keys, but valid keys must be present
+                    continue
+                field, convert = entry
+                record[field] = convert(value.strip())
+        except ValueError as e:
+            # Catch issues like int('not_a_number') or split errors
+            raise InvalidDataFormatError(f"Error parsing numeric or key/value pair: {e}")
+        return record
+
+    def _check_required(self, record):
+        if len(record) != self._field_count:
+            for raw_key, field, _ in self.fields:
+                if field not in record:
+                    raise InvalidDataFormatError(f"{self.label} is missing required field: {raw_key}")
+
+    def parse_block(self, lines):
+        """Convert a block's lines into a dictionary without validating it"""
+        return self._convert_lines(lines, self._parse_table)
+
+    def validate(self, record):
+        """
+        Validate an already-parsed record dictionary.
+        Returns: True if valid
+        Raises: InvalidDataFormatError if a field is missing or invalid
+        """
+        for raw_key, field, field_type in self.fields:
+            if field not in record:
+                raise InvalidDataFormatError(f"{self.label} is missing required field: {raw_key}")
+
+            value = record[field]
+            if field_type is int and (not isinstance(value, int) or value < 0):
+                raise InvalidDataFormatError(self.int_error.format(field=field))
+            if field in self.choices and value not in self.choices[field]:
+                raise InvalidDataFormatError(self._choice_error(field, value))
+        return True
+
+    def load_block(self, lines):
+        """
+        Parse and validate a block in a single pass.
+        Raises: InvalidDataFormatError with the file type as context
+        """
+        try:
+            record = self._convert_lines(lines, self._load_table)
+            self._check_required(record)
+        except InvalidDataFormatError as e:
+            # Re-raise with context about which file failed
+            raise InvalidDataFormatError(f"{self.plural} file format error: {e}")
+        return record
+
+QUEST_SCHEMA = RecordSchema("Quest", [
+    ('QUEST_ID', 'quest_id', str),
+    ('TITLE', 'title', str),
+    ('DESCRIPTION', 'description', str),
+    ('REWARD_XP', 'reward_xp', int),
+    ('REWARD_GOLD', 'reward_gold', int),
+    ('REQUIRED_LEVEL', 'required_level', int),
+    ('PREREQUISITE', 'prerequisite', str)
+])
+
+ITEM_SCHEMA = RecordSchema("Item", [
+    ('ITEM_ID', 'item_id', str),
+    ('NAME', 'name', str),
+    ('TYPE', 'type', str),
+    ('EFFECT', 'effect', str),
+    ('COST', 'cost', int),
+    ('DESCRIPTION', 'description', str)
+], choices={'type': ['weapon', 'armor', 'consumable']},
+   int_error="Item {field} must be a non-negative integer.")
+
+ENEMY_SCHEMA = RecordSchema("Enemy", [
+    ('ENEMY_ID', 'enemy_id', str),
+    ('NAME', 'name', str),
+    ('HEALTH', 'health', int),
+    ('STRENGTH', 'strength', int),
+    ('MAGIC', 'magic', int),
+    ('XP_REWARD', 'xp_reward', int),
+    ('GOLD_REWARD', 'gold_reward', int),
+    ('MIN_LEVEL', 'min_level', int),
+    ('MAX_LEVEL', 'max_level', int),
+    ('SPAWNS', 'spawns', str)
+], choices={'spawns': ['yes', 'no']},
+   plural="Enemies")
+
+def iter_records(filename, schema):
+    """
+    Yield validated records of any schema from a data file one at a time.
+    """
+    load_block = schema.load_block
+    for lines in _iter_data_blocks(filename):
+        yield load_block(lines)
+
+def load_records(filename, schema):
+    """
+    Load every record of a schema into a dictionary keyed by its ID field.
+    """
+    id_field = schema.id_field
+    return {record[id_field]: record for record in iter_records(filename, schema)}
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
-def _read_data_file(filename):
+def _iter_data_blocks(filename):
     """
-    Helper function to read a data file and split into blocks.
+    Generator that yields one record block at a time as a list of stripped,
+    non-empty lines. Blocks are separated by blank lines.
+    The file is read line by line, so memory use does not grow with file size.
     Raises file-related exceptions.
     """
     try:
-        with open(filename, 'r') as f:
-            content = f.read()
+        f = open(filename, 'r')
     except FileNotFoundError:
         raise MissingDataFileError(f"Required data file not found: {filename}")
     except IOError as e:
         raise CorruptedDataError(f"Could not read data file {filename}: {e}")
-    
-    # Split the file content into blocks separated by two or more newlines
-    blocks = [block.strip() for block in content.split('\n\n') if block.strip()]
-    return blocks
 
-def load_quests(filename="data/quests.txt"):
-    quests = {}
-    
-    blocks = _read_data_file(filename)
-    
-    for block_str in blocks:
-        lines = [line.strip() for line in block_str.split('\n') if line.strip()]
+    with f:
+        lines = []
         try:
-            quest_data = parse_quest_block(lines)
-            validate_quest_data(quest_data)
-            quests[quest_data['quest_id']] = quest_data
-        except InvalidDataFormatError as e:
-            # Re-raise with context about which file failed
-            raise InvalidDataFormatError(f"Quests file format error: {e}")
-            
+            for raw_line in f:
+                line = raw_line.strip()
+                if line:
+                    lines.append(line)
+                elif lines:
+                    yield lines
+                    lines = []
+        except (IOError, UnicodeDecodeError) as e:
+            raise CorruptedDataError(f"Could not read data file {filename}: {e}")
+        if lines:
+            yield lines
+
+def _read_data_file(filename):
+    """
+    Helper function to read a data file and split into blocks.
+    Raises file-related exceptions.
+    """
+    return ['\n'.join(lines) for lines in _iter_data_blocks(filename)]
+
+def load_quests(filename="data/quests.txt", use_cache=True, compact=False):
+    """
+    Load all quests from a data file.
+    Uses the compiled cache sidecar when it matches the file on disk.
+    With compact=True, each quest is a read-only QuestRecord instead of a dict.
+    """
+    if use_cache:
+        quests = _load_with_cache(filename, "quests", _parse_quests_file)
+    else:
+        quests = _parse_quests_file(filename)
+    if compact:
+        compact_records(quests, QuestRecord)
     return quests
 
-def load_items(filename="data/items.txt"):
-    items = {}
-    
-    blocks = _read_data_file(filename)
-    
-    for block_str in blocks:
-        lines = [line.strip() for line in block_str.split('\n') if line.strip()]
-        try:
-            item_data = parse_item_block(lines)
-            validate_item_data(item_data)
-            items[item_data['item_id']] = item_data
-        except InvalidDataFormatError as e:
-            # Re-raise with context about which file failed
-            raise InvalidDataFormatError(f"Items file format error: {e}")
-            
+def load_items(filename="data/items.txt", use_cache=True, lazy=False, compact=False):
+    """
+    Load all items from a data file.
+    Uses the compiled cache sidecar when it matches the file on disk.
+    With lazy=True, returns a read-only LazyItemCatalog that parses each
+    item only the first time it is accessed.
+    With compact=True, each item is a read-only ItemRecord instead of a dict.
+    """
+    if lazy:
+        return LazyItemCatalog(filename)
+    if use_cache:
+        items = _load_with_cache(filename, "items", _parse_items_file)
+    else:
+        items = _parse_items_file(filename)
+    if compact:
+        compact_records(items, ItemRecord)
     return items
 
+def load_enemies(filename="data/enemies.txt", use_cache=True):
+    """
+    Load all enemy definitions from a data file.
+    MAX_LEVEL 0 means the enemy has no upper level limit; SPAWNS: no keeps
+    an enemy out of random level-based selection.
+    Uses the compiled cache sidecar when it matches the file on disk.
+    """
+    if use_cache:
+        return _load_with_cache(filename, "enemies", _parse_enemies_file)
+    return _parse_enemies_file(filename)
+
+def load_default_enemies():
+    """
+    Returns: The built-in enemy definitions (DEFAULT_ENEMIES_DATA), for when
+             no enemies file exists
+    """
+    enemies = {}
+    for block in DEFAULT_ENEMIES_DATA.strip().split("\n\n"):
+        enemy = ENEMY_SCHEMA.load_block(block.splitlines())
+        enemies[enemy['enemy_id']] = enemy
+    _check_enemy_levels(enemies)
+    return enemies
+
+def iter_quests(filename="data/quests.txt"):
+    """
+    Yield validated quest dictionaries one at a time.
+    For callers that never need the whole quest dict in memory.
+    """
+    return iter_records(filename, QUEST_SCHEMA)
+
+def iter_items(filename="data/items.txt"):
+    """
+    Yield validated item dictionaries one at a time.
+    For callers that never need the whole item dict in memory.
+    """
+    return iter_records(filename, ITEM_SCHEMA)
+
+def _parse_quests_file(filename):
+    return load_records(filename, QUEST_SCHEMA)
+
+def _parse_items_file(filename):
+    return load_records(filename, ITEM_SCHEMA)
+
+def _parse_enemies_file(filename):
+    enemies = load_records(filename, ENEMY_SCHEMA)
+    _check_enemy_levels(enemies)
+    return enemies
+
+def _check_enemy_levels(enemies):
+    for enemy_id, enemy in enemies.items():
+        if enemy['max_level'] and enemy['max_level'] < enemy['min_level']:
+            raise InvalidDataFormatError(
+                f"Enemies file format error: Enemy '{enemy_id}' MAX_LEVEL must be 0 (no limit) "
+                f"or at least MIN_LEVEL."
+            )
+
 def validate_quest_data(quest_dict):
-    required_fields = {
-        'QUEST_ID': 'quest_id', 'TITLE': 'title', 'DESCRIPTION': 'description',
-        'REWARD_XP': 'reward_xp', 'REWARD_GOLD': 'reward_gold', 
-        'REQUIRED_LEVEL': 'required_level', 'PREREQUISITE': 'prerequisite'
-    }
-    
-    numeric_fields = ['reward_xp', 'reward_gold', 'required_level']
-
-    for raw_key, field in required_fields.items():
-        if field not in quest_dict:
-            raise InvalidDataFormatError(f"Quest is missing required field: {raw_key}")
-            
-        value = quest_dict[field]
-        
-        if field in numeric_fields:
-            if not isinstance(value, int) or value < 0:
-                raise InvalidDataFormatError(f"Quest field '{field}' must be a non-negative integer.")
+    """
+    Validate that a quest dictionary has all required fields
+    Returns: True if valid
+    Raises: InvalidDataFormatError if missing fields or invalid values
+    """
+    return QUEST_SCHEMA.validate(quest_dict)
+
+def validate_item_data(item_dict):
+    """
+    Validate that an item dictionary has all required fields
+    Returns: True if valid
+    Raises: InvalidDataFormatError if missing fields or invalid values
+    """
+    return ITEM_SCHEMA.validate(item_dict)
 
+def validate_enemy_data(enemy_dict):
+    """
+    Validate that an enemy dictionary has all required fields
+    Returns: True if valid
+    Raises: InvalidDataFormatError if missing fields or invalid values
+    """
+    ENEMY_SCHEMA.validate(enemy_dict)
+    _check_enemy_levels({enemy_dict['enemy_id']: enemy_dict})
     return True
 
-def validate_item_data(item_dict):
-    required_fields = {
-        'ITEM_ID': 'item_id', 'NAME': 'name', 'TYPE': 'type', 
-        'EFFECT': 'effect', 'COST': 'cost', 'DESCRIPTION': 'description'
+# ============================================================================
+# COMPACT RECORDS
+# ============================================================================
+
+class _CompactRecord:
+    """
+    Read-only record stored in __slots__ instead of a per-record dict.
+    Supports the dict-style access used by the game (record['key'],
+    record.get(), 'key' in record, keys()/items()).
+    Subclasses list their dictionary keys in _fields and which of them hold
+    enumerated values to intern in _interned.
+    """
+    __slots__ = ()
+    _fields = ()
+    _interned = ()
+
+    def __init__(self, **values):
+        for field in self._fields:
+            value = values[field]
+            if field in self._interned:
+                value = sys.intern(value)
+            object.__setattr__(self, field, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: data[field] for field in cls._fields})
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key):
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in self._fields:
+            return default
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def keys(self):
+        return list(self._fields)
+
+    def values(self):
+        return [getattr(self, field) for field in self._fields]
+
+    def items(self):
+        return [(field, getattr(self, field)) for field in self._fields]
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self._fields}
+
+    def __eq__(self, other):
+        if isinstance(other, _CompactRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self.values()))
+
+    def __reduce__(self):
+        return (_rebuild_record, (type(self), self.to_dict()))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+def _rebuild_record(record_class, data):
+    return record_class.from_dict(data)
+
+class QuestRecord(_CompactRecord):
+    """Compact quest record with the same keys as a loaded quest dict"""
+    __slots__ = ('quest_id', 'title', 'description', 'reward_xp', 'reward_gold',
+                 'required_level', 'prerequisite')
+    _fields = __slots__
+    _interned = frozenset(['quest_id', 'prerequisite'])
+
+def _parse_effect(effect):
+    """
+    Split an effect string like 'health:20' into its stat and value.
+    Returns: (stat_name, value) - ("none", 0) if there is no effect, and a
+             value of 0 if it is not an integer
+    """
+    if not effect or ':' not in effect:
+        return "none", 0
+    stat_text, value_text = effect.split(':', 1)
+    try:
+        value = int(value_text.strip())
+    except ValueError:
+        value = 0
+    return stat_text.strip(), value
+
+class ItemRecord(_CompactRecord):
+    """
+    Compact item record with the same keys as a loaded item dict.
+    The effect is also pre-parsed into effect_stat and effect_value.
+    """
+    __slots__ = ('item_id', 'name', 'type', 'effect', 'cost', 'description',
+                 'effect_stat', 'effect_value')
+    _fields = ('item_id', 'name', 'type', 'effect', 'cost', 'description')
+    _interned = frozenset(['item_id', 'type', 'effect'])
+
+    def __init__(self, **values):
+        super().__init__(**values)
+        stat_name, value = _parse_effect(self.effect)
+        object.__setattr__(self, 'effect_stat', sys.intern(stat_name))
+        object.__setattr__(self, 'effect_value', value)
+
+def compact_records(records, record_class):
+    """
+    Replace each dict in records with a compact record, in place, so the
+    original dicts are released one at a time.
+    Returns: records
+    """
+    from_dict = record_class.from_dict
+    for record_id in records:
+        records[record_id] = from_dict(records[record_id])
+    return records
+
+# ============================================================================
+# COLUMNAR ANALYTICS
+# ============================================================================
+
+QUEST_COLUMNS = ('reward_xp', 'reward_gold', 'required_level')
+
+def _use_numpy(use_numpy):
+    if use_numpy is None:
+        return np is not None
+    if use_numpy and np is None:
+        raise ImportError("NumPy is not installed")
+    return use_numpy
+
+def _make_column(values, use_numpy):
+    if use_numpy:
+        return np.fromiter(values, dtype=np.int64)
+    return array('q', values)
+
+def build_quest_columns(quests, use_numpy=None):
+    """
+    Build array-backed columns over a quests dictionary for bulk reports.
+    Uses NumPy arrays when available (or use_numpy=True), else array.array.
+    Returns: {'ids': [...], 'reward_xp': col, 'reward_gold': col, 'required_level': col}
+    """
+    use_numpy = _use_numpy(use_numpy)
+    records = list(quests.values())
+    columns = {'ids': list(quests), 'numpy': use_numpy}
+    for field in QUEST_COLUMNS:
+        columns[field] = _make_column((record[field] for record in records), use_numpy)
+    return columns
+
+def build_item_columns(items, use_numpy=None):
+    """
+    Build array-backed columns over an items dictionary for bulk reports.
+    Item type and effect stat are stored as small integer codes.
+    Returns: {'ids', 'cost', 'effect_value', 'type_code', 'type_names',
+              'stat_code', 'stat_names'}
+    """
+    use_numpy = _use_numpy(use_numpy)
+    records = list(items.values())
+    type_codes = {}
+    stat_codes = {}
+    costs = []
+    effect_values = []
+    item_types = []
+    stats = []
+
+    for record in records:
+        stat_name, value = _parse_effect(record.get('effect', ''))
+        costs.append(record['cost'])
+        effect_values.append(value)
+        item_types.append(type_codes.setdefault(record['type'], len(type_codes)))
+        stats.append(stat_codes.setdefault(stat_name, len(stat_codes)))
+
+    return {
+        'ids': list(items),
+        'numpy': use_numpy,
+        'cost': _make_column(costs, use_numpy),
+        'effect_value': _make_column(effect_values, use_numpy),
+        'type_code': _make_column(item_types, use_numpy),
+        'type_names': list(type_codes),
+        'stat_code': _make_column(stats, use_numpy),
+        'stat_names': list(stat_codes)
     }
-    valid_types = ['weapon', 'armor', 'consumable']
-    
-    for raw_key, field in required_fields.items():
-        if field not in item_dict:
-            raise InvalidDataFormatError(f"Item is missing required field: {raw_key}")
-            
-        value = item_dict[field]
-        
-        if field == 'type' and value not in valid_types:
-            raise InvalidDataFormatError(f"Item type '{value}' is invalid. Must be one of: {', '.join(valid_types)}")
-        
-        if field == 'cost' and (not isinstance(value, int) or value < 0):
-            raise InvalidDataFormatError(f"Item cost must be a non-negative integer.")
-            
-    return True
+
+def total_reward_xp_by_level_band(quest_columns, band_size=5):
+    """
+    Sum reward XP per required-level band (1-5, 6-10, ...).
+    Returns: {(low_level, high_level): total_xp}
+    """
+    levels = quest_columns['required_level']
+    rewards = quest_columns['reward_xp']
+    if len(levels) == 0:
+        return {}
+
+    if quest_columns['numpy']:
+        bands = (np.maximum(levels, 1) - 1) // band_size
+        totals = np.bincount(bands, weights=rewards).astype(np.int64)
+        return {
+            (band * band_size + 1, (band + 1) * band_size): int(total)
+            for band, total in enumerate(totals) if total
+        }
+
+    totals = {}
+    for level, reward in zip(levels, rewards):
+        band = (max(level, 1) - 1) // band_size
+        totals[band] = totals.get(band, 0) + reward
+    return {
+        (band * band_size + 1, (band + 1) * band_size): totals[band]
+        for band in sorted(totals) if totals[band]
+    }
+
+def gold_to_xp_ratios(quest_columns):
+    """
+    Return the reward gold / reward XP ratio of every quest (0.0 when a quest
+    gives no XP), in the same order as quest_columns['ids'].
+    """
+    gold = quest_columns['reward_gold']
+    xp = quest_columns['reward_xp']
+
+    if quest_columns['numpy']:
+        ratios = np.zeros(len(xp), dtype=np.float64)
+        np.divide(gold, xp, out=ratios, where=xp != 0)
+        return ratios
+
+    return array('d', (g / x if x else 0.0 for g, x in zip(gold, xp)))
+
+def cost_histogram_by_type(item_columns, bin_width=50):
+    """
+    Count items per cost bin for each item type.
+    Returns: {item_type: {bin_start_cost: count}}
+    """
+    costs = item_columns['cost']
+    type_codes = item_columns['type_code']
+    histograms = {}
+
+    if item_columns['numpy']:
+        bins = costs // bin_width
+        for code, item_type in enumerate(item_columns['type_names']):
+            counts = np.bincount(bins[type_codes == code])
+            histograms[item_type] = {
+                int(b) * bin_width: int(count) for b, count in enumerate(counts) if count
+            }
+        return histograms
+
+    counts_by_code = [{} for _ in item_columns['type_names']]
+    for cost, code in zip(costs, type_codes):
+        counts = counts_by_code[code]
+        bin_start = (cost // bin_width) * bin_width
+        counts[bin_start] = counts.get(bin_start, 0) + 1
+    for code, item_type in enumerate(item_columns['type_names']):
+        histograms[item_type] = dict(sorted(counts_by_code[code].items()))
+    return histograms
+
+# ============================================================================
+# INDEXED ITEM CATALOG
+# ============================================================================
+
+class ItemCatalog(MutableMapping):
+    """
+    Dictionary of item_id -> item data with secondary indexes built at load time:
+    by TYPE, by the stat name in EFFECT, and cost-sorted lists (overall and per
+    type) for bisect range queries.
+    Lookups by ID stay O(1); filtered listings cost O(log n + k).
+    The indexes are kept up to date when items are added, replaced or removed.
+    """
+
+    def __init__(self, items=None):
+        self._items = {}
+        self._by_type = {}
+        self._by_stat = {}
+        self._by_cost = []
+        self._by_type_cost = {}
+        if items:
+            # Bulk build: append the cost keys, then sort each list once
+            # (insort per item is O(n^2) for large catalogs)
+            for item_id, item in items.items():
+                self._items[item_id] = item
+                self._index(item_id, item, add_cost_key=list.append)
+            self._by_cost.sort()
+            for entries in self._by_type_cost.values():
+                entries.sort()
+
+    # ---- Mapping interface ----
+
+    def __getitem__(self, item_id):
+        return self._items[item_id]
+
+    def __setitem__(self, item_id, item):
+        if item_id in self._items:
+            self._unindex(item_id, self._items[item_id])
+        self._items[item_id] = item
+        self._index(item_id, item)
+
+    def __delitem__(self, item_id):
+        item = self._items.pop(item_id)
+        self._unindex(item_id, item)
+
+    def __contains__(self, item_id):
+        return item_id in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return f"ItemCatalog({self._items!r})"
+
+    # ---- Index maintenance ----
+
+    def _index(self, item_id, item, add_cost_key=insort):
+        item_type = item.get('type')
+        cost_key = (item.get('cost', 0), item_id)
+        # Dicts keep insertion order and give O(1) removal
+        self._by_type.setdefault(item_type, {})[item_id] = None
+        self._by_stat.setdefault(_parse_effect(item.get('effect', ''))[0], {})[item_id] = None
+        add_cost_key(self._by_cost, cost_key)
+        add_cost_key(self._by_type_cost.setdefault(item_type, []), cost_key)
+
+    def _unindex(self, item_id, item):
+        item_type = item.get('type')
+        cost_key = (item.get('cost', 0), item_id)
+        _discard_from_index(self._by_type, item_type, item_id)
+        _discard_from_index(self._by_stat, _parse_effect(item.get('effect', ''))[0], item_id)
+        _remove_sorted(self._by_cost, cost_key)
+        _remove_sorted(self._by_type_cost[item_type], cost_key)
+        if not self._by_type_cost[item_type]:
+            del self._by_type_cost[item_type]
+
+    # ---- Queries ----
+
+    def get_items_by_type(self, item_type):
+        """Return all items of a type (e.g. 'weapon')"""
+        return [self._items[item_id] for item_id in self._by_type.get(item_type, ())]
+
+    def get_items_by_stat(self, stat_name):
+        """Return all items whose EFFECT changes stat_name"""
+        return [self._items[item_id] for item_id in self._by_stat.get(stat_name, ())]
+
+    def get_items_in_cost_range(self, min_cost=None, max_cost=None, item_type=None):
+        """
+        Return items with min_cost <= cost <= max_cost, cheapest first.
+        Either bound may be None. Optionally restrict to one item type.
+        """
+        if item_type is None:
+            entries = self._by_cost
+        else:
+            entries = self._by_type_cost.get(item_type, [])
+
+        start = 0 if min_cost is None else bisect_left(entries, (min_cost,))
+        end = len(entries) if max_cost is None else bisect_left(entries, (max_cost + 1,))
+        return [self._items[item_id] for _, item_id in entries[start:end]]
+
+    def get_item_types(self):
+        """Return the item types present in the catalog"""
+        return list(self._by_type)
+
+def _discard_from_index(index, key, item_id):
+    bucket = index.get(key)
+    if bucket is not None:
+        bucket.pop(item_id, None)
+        if not bucket:
+            del index[key]
+
+def _remove_sorted(entries, entry):
+    position = bisect_left(entries, entry)
+    if position < len(entries) and entries[position] == entry:
+        del entries[position]
+
+def load_item_catalog(filename="data/items.txt", use_cache=True):
+    """
+    Load items and wrap them in an indexed ItemCatalog.
+    """
+    return ItemCatalog(load_items(filename, use_cache))
+
+# ============================================================================
+# SHARDED DATA DIRECTORIES
+# ============================================================================
+
+SHARD_EXTENSION = ".txt"
+
+def list_data_shards(directory):
+    """
+    Return the sorted shard file paths in a data directory.
+    Raises: MissingDataFileError if the directory does not exist
+    """
+    try:
+        names = sorted(os.listdir(directory))
+    except FileNotFoundError:
+        raise MissingDataFileError(f"Required data directory not found: {directory}")
+    except OSError as e:
+        raise CorruptedDataError(f"Could not read data directory {directory}: {e}")
+
+    return [os.path.join(directory, name) for name in names if name.endswith(SHARD_EXTENSION)]
+
+def load_quest_shards(directory="data/quests.d", max_workers=None, use_cache=True):
+    """
+    Load every quest shard in a directory, parsing shards in parallel.
+    Raises: InvalidDataFormatError if a quest ID appears in more than one shard
+    """
+    return _load_shards(directory, load_quests, "Quest", max_workers, use_cache)
+
+def load_item_shards(directory="data/items.d", max_workers=None, use_cache=True):
+    """
+    Load every item shard in a directory, parsing shards in parallel.
+    Raises: InvalidDataFormatError if an item ID appears in more than one shard
+    """
+    return _load_shards(directory, load_items, "Item", max_workers, use_cache)
+
+def _load_shards(directory, load_func, label, max_workers, use_cache):
+    shard_paths = list_data_shards(directory)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(shard_paths))
+
+    if max_workers <= 1:
+        # Not worth paying for worker start-up
+        shard_results = [load_func(path, use_cache) for path in shard_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            shard_results = list(executor.map(load_func, shard_paths, [use_cache] * len(shard_paths)))
+
+    return _merge_shards(shard_paths, shard_results, label)
+
+def _merge_shards(shard_paths, shard_results, label):
+    merged = {}
+    source_shard = {}
+
+    for path, records in zip(shard_paths, shard_results):
+        for record_id, record in records.items():
+            if record_id in merged:
+                raise InvalidDataFormatError(
+                    f"Duplicate {label.lower()} ID '{record_id}' in {source_shard[record_id]} and {path}"
+                )
+            merged[record_id] = record
+            source_shard[record_id] = path
+
+    return merged
+
+# ============================================================================
+# HOT RELOAD
+# ============================================================================
+
+class _WatchedDataFile:
+    """
+    Tracks one data file by (size, mtime) and fingerprints each record block
+    so that only added or edited blocks need to be parsed again.
+    """
+
+    def __init__(self, filename, schema):
+        self.filename = filename
+        self.id_field = schema.id_field
+        self.id_prefix = f"{schema.id_key}: "
+        self.parse_record = schema.load_block
+        self.stamp = None
+        self.digest_by_id = {}
+
+    def _get_stamp(self):
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            raise MissingDataFileError(f"Required data file not found: {self.filename}")
+        except OSError as e:
+            raise CorruptedDataError(f"Could not read data file {self.filename}: {e}")
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _scan_blocks(self):
+        """Yield (digest, lines) for every block in the file"""
+        for lines in _iter_data_blocks(self.filename):
+            digest = hashlib.sha1('\n'.join(lines).encode('utf-8')).digest()
+            yield digest, lines
+
+    def _get_block_id(self, lines):
+        for line in lines:
+            if line.startswith(self.id_prefix):
+                return line[len(self.id_prefix):].strip()
+        return None
+
+    def prime(self):
+        """Fingerprint the file as it is now without parsing any records"""
+        self.stamp = self._get_stamp()
+        self.digest_by_id = {}
+        for digest, lines in self._scan_blocks():
+            record_id = self._get_block_id(lines)
+            if record_id is not None:
+                self.digest_by_id[record_id] = digest
+
+    def poll(self, records):
+        """
+        Re-parse the blocks that changed since the last poll and apply them
+        to records in place.
+        Returns: Dictionary with 'added', 'changed' and 'removed' ID lists
+        """
+        diff = {'added': [], 'changed': [], 'removed': []}
+        stamp = self._get_stamp()
+        if stamp == self.stamp:
+            return diff
+
+        known_digests = set(self.digest_by_id.values())
+        new_digest_by_id = {}
+        updates = {}
+        for digest, lines in self._scan_blocks():
+            if digest in known_digests:
+                record_id = self._get_block_id(lines)
+            else:
+                record = self.parse_record(lines)
+                record_id = record[self.id_field]
+                updates[record_id] = record
+            new_digest_by_id[record_id] = digest
+
+        # Everything parsed cleanly - now apply the changes
+        for record_id, digest in new_digest_by_id.items():
+            old_digest = self.digest_by_id.get(record_id)
+            if old_digest == digest:
+                continue
+            diff['added' if old_digest is None else 'changed'].append(record_id)
+            records[record_id] = updates[record_id]
+
+        for record_id in self.digest_by_id:
+            if record_id not in new_digest_by_id:
+                diff['removed'].append(record_id)
+                records.pop(record_id, None)
+
+        self.stamp = stamp
+        self.digest_by_id = new_digest_by_id
+        return diff
+
+class DataReloader:
+    """
+    Incremental hot reload of the quest and item data files.
+    Call load() once, then poll() periodically to apply content edits to the
+    loaded dictionaries in place without a full re-parse or a restart.
+    """
+
+    def __init__(self, quests_file="data/quests.txt", items_file="data/items.txt"):
+        self.quests = _WatchedDataFile(quests_file, QUEST_SCHEMA)
+        self.items = _WatchedDataFile(items_file, ITEM_SCHEMA)
+
+    def load(self):
+        """
+        Fingerprint both files and load them.
+        Returns: (quests, items) dictionaries
+        """
+        # Fingerprint first so an edit made during loading is picked up by
+        # the next poll instead of being missed
+        self.quests.prime()
+        self.items.prime()
+        return load_quests(self.quests.filename), load_items(self.items.filename)
+
+    def poll(self, quests, items):
+        """
+        Check both files for changes and update quests/items in place.
+        Nothing is modified if a changed block fails to parse.
+        Returns: {'quests': diff, 'items': diff}
+        """
+        return {
+            'quests': self.quests.poll(quests),
+            'items': self.items.poll(items)
+        }
+
+# ============================================================================
+# LAZY ITEM CATALOG
+# ============================================================================
+
+# Blank-line separators between record blocks
+_BLOCK_SEPARATOR = re.compile(rb'\n[ \t\r]*\n(?:[ \t\r]*\n)*')
+_ITEM_ID_LINE = re.compile(rb'^[ \t]*ITEM_ID: (.*)$', re.MULTILINE)
+
+class LazyItemCatalog(Mapping):
+    """
+    Read-only mapping of item_id -> item dictionary backed by a memory-mapped
+    items file. The file is scanned once to index each block's byte range;
+    blocks are parsed and validated the first time they are accessed.
+    Format errors in a block are raised when that item is first accessed.
+    """
+
+    def __init__(self, filename="data/items.txt"):
+        self.filename = filename
+        self._offsets = {}
+        self._records = {}
+        self._file = None
+        self._map = None
+
+        try:
+            self._file = open(filename, 'rb')
+        except FileNotFoundError:
+            raise MissingDataFileError(f"Required data file not found: {filename}")
+        except IOError as e:
+            raise CorruptedDataError(f"Could not read data file {filename}: {e}")
+
+        try:
+            if os.fstat(self._file.fileno()).st_size > 0:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._build_index()
+        except (OSError, ValueError) as e:
+            self.close()
+            raise CorruptedDataError(f"Could not read data file {filename}: {e}")
+        except InvalidDataFormatError:
+            self.close()
+            raise
+
+    def _build_index(self):
+        data = self._map
+        start = 0
+        for separator in _BLOCK_SEPARATOR.finditer(data):
+            self._index_block(start, separator.start())
+            start = separator.end()
+        self._index_block(start, len(data))
+
+    def _index_block(self, start, end):
+        match = _ITEM_ID_LINE.search(self._map, start, end)
+        if match is None:
+            if self._map[start:end].strip():
+                raise InvalidDataFormatError("Items file format error: Item is missing required field: ITEM_ID")
+            return
+        item_id = match.group(1).strip().decode('utf-8')
+        self._offsets[item_id] = (start, end)
+
+    def __getitem__(self, item_id):
+        record = self._records.get(item_id)
+        if record is not None:
+            return record
+
+        start, end = self._offsets[item_id]
+        try:
+            block = self._map[start:end].decode('utf-8')
+        except UnicodeDecodeError as e:
+            raise CorruptedDataError(f"Could not read data file {self.filename}: {e}")
+        lines = [line.strip() for line in block.split('\n') if line.strip()]
+        record = ITEM_SCHEMA.load_block(lines)
+        self._records[item_id] = record
+        return record
+
+    def __contains__(self, item_id):
+        return item_id in self._offsets
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def close(self):
+        """Release the memory map and file handle"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# ============================================================================
+# COMPILED DATA CACHE
+# ============================================================================
+
+def _get_cache_path(filename):
+    return filename + CACHE_SUFFIX
+
+def _get_file_stamp(filename):
+    """
+    Return (size, mtime_ns, content hash) for a data file.
+    Raises OSError if the file cannot be read.
+    """
+    stat = os.stat(filename)
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return (stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+
+def _read_cache(cache_path, kind, stamp):
+    """
+    Return the cached records if the sidecar matches stamp, otherwise None.
+    A missing, stale or corrupt sidecar is treated the same way (a miss).
+    """
+    try:
+        # marshal.load() on a file object reads in small chunks and is several
+        # times slower than decoding the whole buffer at once
+        with open(cache_path, 'rb') as f:
+            payload = marshal.loads(f.read())
+    except OSError:
+        return None
+    except (EOFError, ValueError, TypeError):
+        # Truncated or garbled sidecar - it will be rebuilt
+        return None
+
+    if not isinstance(payload, dict):
+        return None
+    if payload.get('version') != CACHE_FORMAT_VERSION or payload.get('kind') != kind:
+        return None
+    if tuple(payload.get('stamp', ())) != stamp:
+        return None
+
+    records = payload.get('records')
+    if not isinstance(records, dict):
+        return None
+    return records
+
+def _write_cache(cache_path, kind, stamp, records):
+    """
+    Write the cache sidecar atomically. Failures are ignored because the
+    cache is only an optimization (e.g. the data directory is read-only).
+    """
+    payload = {
+        'version': CACHE_FORMAT_VERSION,
+        'kind': kind,
+        'stamp': stamp,
+        'records': records
+    }
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(marshal.dumps(payload))
+        os.replace(temp_path, cache_path)
+    except (OSError, ValueError):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+def _load_with_cache(filename, kind, parse_func):
+    """
+    Load records through the compiled cache, rebuilding it when the data
+    file's size, mtime or content hash no longer match.
+    """
+    try:
+        stamp = _get_file_stamp(filename)
+    except OSError:
+        # Let the regular parser raise the matching data exception
+        return parse_func(filename)
+
+    cache_path = _get_cache_path(filename)
+    records = _read_cache(cache_path, kind, stamp)
+    if records is not None:
+        return records
+
+    records = parse_func(filename)
+    _write_cache(cache_path, kind, stamp, records)
+    return records
+
+def clear_data_cache(filename):
+    """
+    Remove the cache sidecar for a data file.
+    Returns: True if a sidecar was removed
+    """
+    try:
+        os.remove(_get_cache_path(filename))
+        return True
+    except OSError:
+        return False
+
+DEFAULT_ENEMIES_DATA = """
+ENEMY_ID: goblin
+NAME: Goblin
+HEALTH: 50
+STRENGTH: 8
+MAGIC: 2
+XP_REWARD: 25
+GOLD_REWARD: 10
+MIN_LEVEL: 1
+MAX_LEVEL: 2
+SPAWNS: yes
+
+ENEMY_ID: orc
+NAME: Orc
+HEALTH: 80
+STRENGTH: 12
+MAGIC: 5
+XP_REWARD: 50
+GOLD_REWARD: 25
+MIN_LEVEL: 3
+MAX_LEVEL: 5
+SPAWNS: yes
+
+ENEMY_ID: dragon
+NAME: Dragon
+HEALTH: 200
+STRENGTH: 25
+MAGIC: 15
+XP_REWARD: 200
+GOLD_REWARD: 100
+MIN_LEVEL: 6
+MAX_LEVEL: 0
+SPAWNS: yes
+
+ENEMY_ID: skeleton
+NAME: Skeleton
+HEALTH: 40
+STRENGTH: 10
+MAGIC: 0
+XP_REWARD: 20
+GOLD_REWARD: 5
+MIN_LEVEL: 1
+MAX_LEVEL: 0
+SPAWNS: no
+"""
 
 def create_default_data_files():
     DATA_DIR = "data"
     QUESTS_FILE = os.path.join(DATA_DIR, "quests.txt")
     ITEMS_FILE = os.path.join(DATA_DIR, "items.txt")
+    ENEMIES_FILE = os.path.join(DATA_DIR, "enemies.txt")
     
     # Create data/ directory if it doesn't exist
     if not os.path.exists(DATA_DIR):
@@ -173,69 +1230,116 @@ DESCRIPTION: A basic iron sword.
         except IOError as e:
             print(f"Warning: Could not write default items file: {e}")
 
+    # Create default enemies.txt
+    if not os.path.exists(ENEMIES_FILE):
+        try:
+            with open(ENEMIES_FILE, 'w') as f:
+                f.write(DEFAULT_ENEMIES_DATA.strip() + "\n")
+        except IOError as e:
+            print(f"Warning: Could not write default enemies file: {e}")
+
+# ============================================================================
+# SYNTHETIC CONTENT GENERATOR
+# ============================================================================
+
+# (type, weight, effect stats, base cost)
+SYNTHETIC_ITEM_TYPES = [
+    ('consumable', 50, ['health', 'health', 'health', 'strength', 'magic'], 20),
+    ('weapon', 25, ['strength', 'strength', 'magic'], 120),
+    ('armor', 25, ['max_health', 'max_health', 'magic'], 90)
+]
+SYNTHETIC_MAX_LEVEL = 50
+
+def write_synthetic_quests(filename, count, seed=0):
+    """
+    Write count synthetic quests whose prerequisites form a DAG.
+    Each quest depends on an earlier, usually recent, quest (or none), and
+    its required level is never below its prerequisite's, so chains get harder.
+    """
+    rng = random.Random(seed)
+    levels = array('i')
+
+    with open(filename, 'w') as f:
+        for index in range(count):
+            if index == 0 or rng.random() < 0.15:
+                prerequisite = 'NONE'
+                level = rng.randint(1, 3)
+            else:
+                # Mostly extend a recent storyline, sometimes branch off an old one
+                if rng.random() < 0.8:
+                    parent = rng.randint(max(0, index - 20), index - 1)
+                else:
+                    parent = rng.randint(0, index - 1)
+                prerequisite = f"quest_{parent}"
+                level = min(SYNTHETIC_MAX_LEVEL, levels[parent] + rng.randint(0, 2))
+            levels.append(level)
+
+            reward_xp = level * 50 + rng.randint(0, 10) * 10
+            reward_gold = level * 25 + rng.randint(0, 10) * 5
+            f.write(
+                f"QUEST_ID: quest_{index}\n"
+                f"TITLE: Quest {index}\n"
+                f"DESCRIPTION: A synthetic level {level} quest\n"
+                f"REWARD_XP: {reward_xp}\n"
+                f"REWARD_GOLD: {reward_gold}\n"
+                f"REQUIRED_LEVEL: {level}\n"
+                f"PREREQUISITE: {prerequisite}\n\n"
+            )
+
+def write_synthetic_items(filename, count, seed=0, start_index=0):
+    """
+    Write count synthetic items with a weighted mix of types and long-tailed
+    (log-normal) costs. IDs start at item_<start_index>.
+    """
+    rng = random.Random(seed)
+    weights = [weight for _, weight, _, _ in SYNTHETIC_ITEM_TYPES]
+
+    with open(filename, 'w') as f:
+        for index in range(start_index, start_index + count):
+            item_type, _, stats, base_cost = rng.choices(SYNTHETIC_ITEM_TYPES, weights)[0]
+            stat = rng.choice(stats)
+            tier = rng.lognormvariate(0, 0.6)
+            value = max(1, int(tier * 8))
+            cost = max(1, int(base_cost * tier))
+            f.write(
+                f"ITEM_ID: item_{index}\n"
+                f"NAME: Item {index}\n"
+                f"TYPE: {item_type}\n"
+                f"EFFECT: {stat}:{value}\n"
+                f"COST: {cost}\n"
+                f"DESCRIPTION: A synthetic {item_type}\n\n"
+            )
+
+def generate_synthetic_data_files(quest_count, item_count, directory="data/synthetic", seed=0):
+    """
+    Write synthetic quests.txt and items.txt files for load testing.
+    Returns: (quests_path, items_path)
+    """
+    os.makedirs(directory, exist_ok=True)
+    quests_path = os.path.join(directory, "quests.txt")
+    items_path = os.path.join(directory, "items.txt")
+    write_synthetic_quests(quests_path, quest_count, seed)
+    write_synthetic_items(items_path, item_count, seed)
+    return quests_path, items_path
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
 def parse_quest_block(lines):
-    quest = {}
-    mapping = {
-        'QUEST_ID': 'quest_id', 'TITLE': 'title', 'DESCRIPTION': 'description',
-        'REWARD_XP': 'reward_xp', 'REWARD_GOLD': 'reward_gold', 
-        'REQUIRED_LEVEL': 'required_level', 'PREREQUISITE': 'prerequisite'
-    }
-    
-    try:
-        for line in lines:
-            key, value = line.split(': ', 1)
-            
-            # Map the file key to the internal dictionary key
-            internal_key = mapping.get(key.strip())
-            if not internal_key:
-                # Ignore unknown keys, but valid keys must be present (checked in validate)
-                continue
-                
-            # Convert numeric strings to integers
-            if internal_key in ['reward_xp', 'reward_gold', 'required_level']:
-                value = int(value.strip())
-            else:
-                value = value.strip()
-                
-            quest[internal_key] = value
-            
-    except ValueError as e:
-        # Catch issues like int('not_a_number') or split errors
-        raise InvalidDataFormatError(f"Error parsing numeric or key/value pair: {e}")
-        
-    return quest
+    """
+    Convert a quest block's lines into a dictionary (numbers become ints).
+    Raises: InvalidDataFormatError if a line or number cannot be parsed
+    """
+    return QUEST_SCHEMA.parse_block(lines)
 
 def parse_item_block(lines):
-    item = {}
-    mapping = {
-        'ITEM_ID': 'item_id', 'NAME': 'name', 'TYPE': 'type', 
-        'EFFECT': 'effect', 'COST': 'cost', 'DESCRIPTION': 'description'
-    }
-    
-    try:
-        for line in lines:
-            key, value = line.split(': ', 1)
-            
-            internal_key = mapping.get(key.strip())
-            if not internal_key:
-                continue
+    """
+    Convert an item block's lines into a dictionary (cost becomes an int).
+    Raises: InvalidDataFormatError if a line or number cannot be parsed
+    """
+    return ITEM_SCHEMA.parse_block(lines)
 
-            if internal_key == 'cost':
-                value = int(value.strip())
-            else:
-                value = value.strip()
-                
-            item[internal_key] = value
-            
-    except ValueError as e:
-        # Catch issues like int('not_a_number') or split errors
-        raise InvalidDataFormatError(f"Error parsing numeric or key/value pair: {e}")
-        
-    return item
 # ============================================================================
 # TESTING
 # ============================================================================
@@ -28,8 +28,10 @@ from custom_exceptions import *
 # Global variables for game data
 current_character = None
 all_quests = {}
-all_items = {}
+all_items = game_data.ItemCatalog()
 game_running = False
+data_reloader = None
+autosaver = None
 
 # ============================================================================
 # UTILITY FUNCTIONS
@@ -135,11 +137,18 @@ def load_game():
 # ============================================================================
 
 def game_loop():
-    global game_running, current_character
+    global game_running, current_character, autosaver
     game_running = True
     
+    # Per-action saves go through a background write-behind saver
+    if autosaver is None:
+        autosaver = character_manager.WriteBehindSaver()
+    
     while game_running:
         
+        # Pick up any content edits made while the game is running
+        reload_game_data()
+
         # Check for death first
         if current_character['health'] <= 0:
             handle_character_death()
@@ -170,9 +179,9 @@ def game_loop():
                 game_running = False
                 print("Game saved. Quitting to main menu.")
             
-            # Save game after each action 
+            # Save game after each action (written in the background)
             if game_running and choice != 6:
-                save_game() 
+                autosave_game()
                 
         except GameError as e:
             print(f"\n[Error] {e}")
@@ -379,8 +388,8 @@ def shop():
             
         elif choice == '1': # Buy Item
             print("\nItems for Sale (ID: Name [Type] - Cost):")
-            for item_id, data in shop_inventory.items():
-                print(f"  {item_id}: {data['name']} [{data['type']}] - {data['cost']} Gold")
+            for data in shop_inventory.get_items_in_cost_range():
+                print(f"  {data['item_id']}: {data['name']} [{data['type']}] - {data['cost']} Gold")
             
             item_id = _get_input("Enter Item ID to Buy: ").lower()
             if item_id in shop_inventory:
@@ -411,31 +420,81 @@ def shop():
 # ============================================================================
 
 def save_game():
+    """Save the current character now, including any pending autosave"""
     global current_character
     if current_character:
         try:
-            character_manager.save_character(current_character)
+            if autosaver is not None:
+                autosaver.submit(current_character)
+                flush_autosave()
+            else:
+                character_manager.save_character(current_character)
         except Exception as e:
             print(f"Warning: Failed to save game: {e}")
 
+def autosave_game():
+    """Queue the current character for a background save"""
+    if current_character and autosaver is not None:
+        autosaver.submit(current_character)
+
+def flush_autosave():
+    """Write any queued autosaves to disk and report failures"""
+    if autosaver is None:
+        return
+    for name, error in autosaver.flush():
+        print(f"Warning: Failed to save game for {name}: {error}")
+
+def close_autosave():
+    """Stop the background saver, writing anything still queued"""
+    global autosaver
+    if autosaver is None:
+        return
+    saver, autosaver = autosaver, None
+    for name, error in saver.close():
+        print(f"Warning: Failed to save game for {name}: {error}")
+
 def load_game_data():
-    global all_quests, all_items
+    global all_quests, all_items, data_reloader
     
+    data_reloader = game_data.DataReloader()
     try:
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        all_quests, items = data_reloader.load()
     except MissingDataFileError as e:
         # If files missing, create defaults and retry loading
         print(f"Error: {e}")
         print("Attempting to create default game data...")
         game_data.create_default_data_files()
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        all_quests, items = data_reloader.load()
+    
+    # Index items by type, effect stat and cost for the shop
+    all_items = game_data.ItemCatalog(items)
+
+    # Enemy prototypes and level index (built-in enemies if the file is missing)
+    combat_system.load_enemy_registry()
+
+def reload_game_data():
+    """Apply edits to the data files to all_quests/all_items in place"""
+    if data_reloader is None:
+        return
+    
+    try:
+        changes = data_reloader.poll(all_quests, all_items)
+    except DataError as e:
+        print(f"Warning: Could not reload game data: {e}")
+        return
+    
+    for kind, diff in changes.items():
+        changed = len(diff['added']) + len(diff['changed']) + len(diff['removed'])
+        if changed:
+            print(f"Reloaded {changed} {kind}.")
 
 def handle_character_death():
     """Handle character death"""
     global current_character, game_running
     
+    # Make sure the state leading up to the death is on disk
+    flush_autosave()
+    
     print("\n" + "#" * 30)
     print("      YOU HAVE BEEN DEFEATED!")
     print("#" * 30)
@@ -498,18 +557,23 @@ def main():
         return
     
     # Main menu loop
-    while True:
-        choice = main_menu()
-        
-        if choice == 1:
-            new_game()
-        elif choice == 2:
-            load_game()
-        elif choice == 3:
-            print("\nThanks for playing Quest Chronicles!")
-            break
-        else:
-            print("Invalid choice. Please select 1-3.")
+    # The autosave thread is a daemon, so it must be closed on every exit
+    # (including Ctrl-C, EOF and crashes) or queued saves are lost
+    try:
+        while True:
+            choice = main_menu()
+            
+            if choice == 1:
+                new_game()
+            elif choice == 2:
+                load_game()
+            elif choice == 3:
+                print("\nThanks for playing Quest Chronicles!")
+                break
+            else:
+                print("Invalid choice. Please select 1-3.")
+    finally:
+        close_autosave()
 
 if __name__ == "__main__":
     main()
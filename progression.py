@@ -0,0 +1,146 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Progression Module
+
+This module handles levelling: cumulative XP thresholds, per-class stat
+growth, and applying XP grants to one or many characters.
+"""
+
+import threading
+from bisect import bisect_right
+
+from custom_exceptions import CharacterDeadError
+
+# ============================================================================
+# PROGRESSION TABLES
+# ============================================================================
+
+def default_level_cost(level):
+    """XP needed to advance from `level` to the next level"""
+    return level * 100
+
+# Stats gained per level; health is restored to max_health on level up
+DEFAULT_STAT_GROWTH = {"max_health": 10, "strength": 2, "magic": 2}
+
+CLASS_STAT_GROWTH = {
+    "Warrior": DEFAULT_STAT_GROWTH,
+    "Mage": DEFAULT_STAT_GROWTH,
+    "Rogue": DEFAULT_STAT_GROWTH,
+    "Cleric": DEFAULT_STAT_GROWTH
+}
+
+class ProgressionTable:
+    """
+    Cumulative XP thresholds for a level cost curve, plus per-class stat
+    growth. A character's total XP is threshold(level) + experience, so the
+    level reached after a grant is one bisect into the thresholds instead
+    of one loop iteration per level. The table grows on demand.
+    """
+
+    def __init__(self, level_cost=default_level_cost, class_growth=None,
+                 default_growth=DEFAULT_STAT_GROWTH):
+        self.level_cost = level_cost
+        self.class_growth = CLASS_STAT_GROWTH if class_growth is None else class_growth
+        self.default_growth = default_growth
+        # _thresholds[i] is the total XP needed to reach level i + 1
+        self._thresholds = [0]
+        self._lock = threading.Lock()
+
+    def _extend_to(self, total_xp):
+        """Grow the table until it has a threshold above total_xp"""
+        if self._thresholds[-1] > total_xp:
+            return
+        with self._lock:
+            thresholds = self._thresholds
+            while thresholds[-1] <= total_xp:
+                level = len(thresholds)
+                cost = self.level_cost(level)
+                if cost <= 0:
+                    raise ValueError(f"Level cost must be positive (level {level} costs {cost})")
+                thresholds.append(thresholds[-1] + cost)
+
+    def threshold(self, level):
+        """Returns: Total XP needed to reach `level` from level 1 with 0 XP"""
+        if level < 1:
+            raise ValueError(f"Level must be at least 1, got {level}")
+        while len(self._thresholds) < level:
+            self._extend_to(self._thresholds[-1])
+        return self._thresholds[level - 1]
+
+    def level_for_xp(self, total_xp):
+        """Returns: The level a character with total_xp cumulative XP is at"""
+        self._extend_to(total_xp)
+        return max(1, bisect_right(self._thresholds, total_xp))
+
+    def growth_for(self, character_class):
+        return self.class_growth.get(character_class, self.default_growth)
+
+    def apply_experience(self, character, xp_amount):
+        """
+        Add XP to a character and apply every level up it earns at once.
+        Returns: Number of levels gained
+        Raises: CharacterDeadError if the character is dead
+        """
+        if character['health'] <= 0:
+            raise CharacterDeadError(f"{character['name']} is dead and cannot gain experience.")
+
+        level = character['level']
+        experience = character['experience'] + xp_amount
+        total_xp = self.threshold(level) + experience
+        new_level = max(level, self.level_for_xp(total_xp))
+
+        if new_level > level:
+            levels_gained = new_level - level
+            for stat, per_level in self.growth_for(character.get('class')).items():
+                character[stat] += per_level * levels_gained
+            character['level'] = new_level
+            experience = total_xp - self.threshold(new_level)
+            # Restore health to max_health
+            character['health'] = character['max_health']
+
+        character['experience'] = experience
+        return new_level - level
+
+    def apply_experience_batch(self, characters, xp_amounts, skip_dead=True):
+        """
+        Apply XP grants to many characters. xp_amounts is one amount for
+        everyone or a sequence with one amount per character.
+        With skip_dead=True dead characters are left unchanged (None in the
+        result); otherwise the first dead character raises CharacterDeadError.
+        Returns: List of levels gained, in the order of characters
+        """
+        characters = list(characters)
+        if isinstance(xp_amounts, (int, float)):
+            xp_amounts = [xp_amounts] * len(characters)
+        elif len(xp_amounts) != len(characters):
+            raise ValueError(f"Got {len(xp_amounts)} XP amounts for {len(characters)} characters")
+
+        # Size the table once for the largest grant
+        if characters:
+            self._extend_to(max(
+                self.threshold(character['level']) + character['experience'] + xp
+                for character, xp in zip(characters, xp_amounts)
+            ))
+
+        results = []
+        for character, xp in zip(characters, xp_amounts):
+            if skip_dead and character['health'] <= 0:
+                results.append(None)
+            else:
+                results.append(self.apply_experience(character, xp))
+        return results
+
+# Table used by character_manager.gain_experience
+DEFAULT_PROGRESSION = ProgressionTable()
+
+# ============================================================================
+# MODULE-LEVEL HELPERS
+# ============================================================================
+
+def apply_experience(character, xp_amount, table=None):
+    """Apply an XP grant using the default table. Returns: Levels gained"""
+    return (table or DEFAULT_PROGRESSION).apply_experience(character, xp_amount)
+
+def apply_experience_batch(characters, xp_amounts, skip_dead=True, table=None):
+    """Apply XP grants to many characters. Returns: List of levels gained"""
+    return (table or DEFAULT_PROGRESSION).apply_experience_batch(characters, xp_amounts, skip_dead)
@@ -0,0 +1,71 @@
+"""
+Test Balance Tournament
+Tests the class/level/enemy tournament runner and its reports
+"""
+
+import pytest
+import sys
+import os
+import csv
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import balance_tournament
+import character_manager
+import combat_system
+
+# ============================================================================
+# TOURNAMENT TESTS
+# ============================================================================
+
+def test_default_grid_covers_every_class_level_and_enemy():
+    """Test the size and order of the default grid"""
+    grid = balance_tournament.build_grid()
+
+    assert len(grid) == 4 * 50 * 4
+    assert grid[0] == ("Warrior", 1, "goblin")
+    assert grid[-1] == ("Cleric", 50, "skeleton")
+
+def test_levelled_character_matches_gain_experience():
+    """Test that tournament characters are levelled through gain_experience"""
+    char = balance_tournament.create_levelled_character("Mage", 10)
+
+    assert char['level'] == 10 and char['experience'] == 0
+    assert char['max_health'] == 80 + 9 * 10 and char['health'] == char['max_health']
+
+def test_parallel_run_matches_in_process_run():
+    """Test that chunked worker processes give the same rows as one process"""
+    grid = balance_tournament.build_grid(levels=range(1, 6))
+    serial = balance_tournament.run_tournament(grid, max_workers=1)
+    parallel = balance_tournament.run_tournament(grid, max_workers=2, chunk_size=7)
+
+    assert parallel == serial
+    assert [(row['class'], row['level'], row['enemy']) for row in serial] == grid
+
+    row = serial[grid.index(("Warrior", 1, "orc"))]
+    char = character_manager.create_character("Check", "Warrior")
+    outcome = combat_system.resolve_battle(char, combat_system.create_enemy("orc"))
+    assert (row['winner'], row['turns'], row['character_health']) == (
+        outcome['winner'], outcome['turns'], outcome['character_health'])
+
+def test_reports_are_written(tmp_path):
+    """Test the CSV and JSON reports"""
+    rows = balance_tournament.run_tournament(
+        balance_tournament.build_grid(classes=["Rogue"], levels=[1, 20], enemy_types=["dragon"]), max_workers=1
+    )
+    balance_tournament.write_csv_report(rows, tmp_path / "balance.csv")
+    balance_tournament.write_json_report(rows, tmp_path / "balance.json")
+
+    with open(tmp_path / "balance.csv", newline="") as f:
+        assert [line['level'] for line in csv.DictReader(f)] == ["1", "20"]
+    with open(tmp_path / "balance.json") as f:
+        report = json.load(f)
+    assert report['summary']['Rogue']['dragon'] == {
+        'battles': 2, 'win_rate': 0.5, 'mean_turns_to_kill': 19.5, 'first_winning_level': 20
+    }
+    assert len(report['results']) == 2
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,156 @@
+"""
+Test Characters
+Tests the Character type and character progression
+"""
+
+import pytest
+import sys
+import os
+import copy
+import pickle
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import inventory_system
+import progression
+
+# ============================================================================
+# CHARACTER TYPE TESTS
+# ============================================================================
+
+def test_character_supports_dict_access():
+    """Test the dict-style access used by the game modules"""
+    char = character_manager.create_character("Slotted", "Warrior")
+
+    assert isinstance(char, character_manager.Character)
+    assert char['health'] == 120 and char.get('class') == "Warrior"
+    assert 'equipped_weapon' not in char
+    assert char.get('equipped_weapon', 'None') == 'None'
+    assert char.setdefault('active_quests', []) is char['active_quests']
+    assert list(char) == list(character_manager.CHARACTER_FIELDS)
+
+    char['equipped_weapon_val'] = ("strength", 5)
+    assert 'equipped_weapon_val' in char
+    del char['equipped_weapon_val']
+    assert 'equipped_weapon_val' not in char
+
+    char['title'] = "the Brave"
+    assert char['title'] == "the Brave" and len(char) == 13
+
+def test_character_rejects_wrong_types():
+    """Test that typed fields are checked on assignment"""
+    char = character_manager.create_character("Typed", "Mage")
+
+    with pytest.raises(InvalidSaveDataError):
+        char['level'] = "two"
+    with pytest.raises(InvalidSaveDataError):
+        del char['gold']
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.Character.from_dict({'name': "Incomplete"})
+    assert char['level'] == 1
+
+@pytest.mark.parametrize("save_format", character_manager.SAVE_FORMATS)
+def test_character_round_trips_through_saves(tmp_path, save_format):
+    """Test that an equipped Character survives save/load unchanged"""
+    char = character_manager.create_character("RoundTrip", "Rogue")
+    inventory_system.add_item_to_inventory(char, "iron_sword")
+    inventory_system.add_item_to_inventory(char, "leather_armor")
+    inventory_system.equip_weapon(char, "iron_sword", {"type": "weapon", "effect": "strength:5"})
+    inventory_system.equip_armor(char, "leather_armor", {"type": "armor", "effect": "max_health:10"})
+    assert char['equipped_weapon_val'] == ["strength", 5]
+
+    character_manager.save_character(char, str(tmp_path), save_format=save_format)
+    character_manager.clear_character_cache()
+    loaded = character_manager.load_character("RoundTrip", str(tmp_path))
+
+    assert isinstance(loaded, character_manager.Character)
+    assert loaded == char
+    assert pickle.loads(pickle.dumps(loaded)) == loaded
+    assert copy.deepcopy(loaded) == loaded
+
+def test_character_copy_is_independent():
+    """Test that copies do not share lists with the original"""
+    char = character_manager.create_character("Original", "Cleric")
+    clone = char.copy()
+    clone['inventory'].append("health_potion")
+
+    assert char['inventory'] == []
+    assert clone['inventory'] == ["health_potion"]
+    assert clone['name'] == "Original"
+
+# ============================================================================
+# PROGRESSION TESTS
+# ============================================================================
+
+def legacy_gain_experience(character, xp_amount):
+    """The original one-level-per-iteration loop"""
+    character['experience'] += xp_amount
+    while character['experience'] >= character['level'] * 100:
+        level_up_xp = character['level'] * 100
+        character['level'] += 1
+        character['experience'] -= level_up_xp
+        character['max_health'] += 10
+        character['strength'] += 2
+        character['magic'] += 2
+        character['health'] = character['max_health']
+
+def test_progression_matches_legacy_loop():
+    """Test that table-driven levelling matches the old loop exactly"""
+    rng = random.Random(163)
+    for _ in range(500):
+        char = character_manager.create_character("Leveller", rng.choice(["Warrior", "Mage", "Rogue", "Cleric"]))
+        char['level'] = rng.randint(1, 30)
+        char['experience'] = rng.randint(0, 4000)
+        char['health'] = rng.randint(1, char['max_health'])
+        expected = char.to_dict()
+        xp = rng.choice([0, 1, 99, 100, rng.randint(0, 5000), rng.randint(0, 500000)])
+
+        legacy_gain_experience(expected, xp)
+        character_manager.gain_experience(char, xp)
+        assert char == expected
+
+def test_progression_without_class_uses_default_growth():
+    """Test that a character dict without 'class' levels like the old loop"""
+    char = {"name": "Classless", "level": 1, "experience": 0, "health": 50,
+            "max_health": 100, "strength": 10, "magic": 10}
+    expected = dict(char)
+
+    legacy_gain_experience(expected, 350)
+    character_manager.gain_experience(char, 350)
+    assert char == expected and char['level'] == 3
+
+def test_huge_grant_and_dead_characters():
+    """Test a very large grant and the dead-character rules"""
+    char = character_manager.create_character("Whale", "Mage")
+    assert progression.apply_experience(char, 50 * 2000 * 1999) == 1999
+    assert char['level'] == 2000 and char['experience'] == 0
+    assert char['max_health'] == 80 + 10 * 1999
+
+    char['health'] = 0
+    with pytest.raises(CharacterDeadError):
+        character_manager.gain_experience(char, 10)
+
+def test_batch_experience_and_custom_tables():
+    """Test batch grants and per-class growth on a custom curve"""
+    table = progression.ProgressionTable(
+        level_cost=lambda level: 50,
+        class_growth={"Warrior": {"max_health": 20, "strength": 3}}
+    )
+    warrior = character_manager.create_character("Tank", "Warrior")
+    mage = character_manager.create_character("Caster", "Mage")
+    dead = character_manager.create_character("Ghost", "Rogue")
+    dead['health'] = 0
+
+    assert progression.apply_experience_batch([warrior, mage, dead], 120, table=table) == [2, 2, None]
+    assert (warrior['max_health'], warrior['strength'], warrior['magic']) == (160, 21, 5)
+    assert (mage['level'], mage['experience'], mage['magic']) == (3, 20, 24)
+    assert dead['level'] == 1
+
+    with pytest.raises(CharacterDeadError):
+        progression.apply_experience_batch([dead], [10], skip_dead=False)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,215 @@
+"""
+Test Combat System
+Tests battle resolution, simulation and enemy definitions
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import combat_system
+
+def random_matchup(rng):
+    character = {"name": "Hero", "health": rng.randint(1, 400), "strength": rng.randint(0, 60)}
+    enemy = {"name": "Foe", "health": rng.randint(-5, 400), "strength": rng.randint(0, 80)}
+    return character, enemy
+
+def play_logged_battle(character, enemy, capsys):
+    battle = combat_system.SimpleBattle(character, enemy)
+    result = battle.start_battle()
+    capsys.readouterr()
+    return result, battle.turns
+
+# ============================================================================
+# ENEMY REGISTRY TESTS
+# ============================================================================
+
+def test_enemies_match_original_definitions():
+    """Test that the data-driven enemies keep their stats and level bands"""
+    assert combat_system.create_enemy("Goblin") == {
+        "name": "Goblin", "health": 50, "max_health": 50, "strength": 8,
+        "magic": 2, "xp_reward": 25, "gold_reward": 10
+    }
+    assert combat_system.get_enemy_types() == ["goblin", "orc", "dragon", "skeleton"]
+    for level, name in [(0, "Goblin"), (2, "Goblin"), (3, "Orc"), (5, "Orc"), (6, "Dragon"), (500, "Dragon")]:
+        assert combat_system.get_random_enemy_for_level(level)['name'] == name
+
+    with pytest.raises(InvalidTargetError):
+        combat_system.create_enemy("lich")
+
+def test_create_enemy_returns_independent_copies():
+    """Test that damaging one enemy does not change the prototype"""
+    first = combat_system.create_enemy("orc")
+    first['health'] = 0
+    assert combat_system.create_enemy("orc")['health'] == 80
+
+def test_level_index_with_many_enemy_types():
+    """Test overlapping ranges, gaps and open-ended enemies in the level index"""
+    enemies = {}
+    for i in range(2000):
+        enemies[f"enemy{i}"] = {
+            "enemy_id": f"enemy{i}", "name": f"Enemy {i}", "health": 10, "strength": 1, "magic": 0,
+            "xp_reward": 1, "gold_reward": 1, "min_level": 10 * i + 1, "max_level": 10 * i + 15, "spawns": "yes"
+        }
+    enemies["enemy1999"]["max_level"] = 0
+    enemies["boss"] = dict(enemies["enemy0"], enemy_id="boss", min_level=1, max_level=0, spawns="no")
+    registry = combat_system.EnemyRegistry(enemies)
+
+    assert registry.enemies_for_level(1) == ("enemy0",)
+    assert registry.enemies_for_level(13) == ("enemy0", "enemy1")
+    assert registry.enemies_for_level(16) == ("enemy1",)
+    assert registry.enemies_for_level(10 ** 6) == ("enemy1999",)
+    assert registry.create("BOSS")['name'] == "Enemy 0"
+
+    gap = combat_system.EnemyRegistry({"low": dict(enemies["enemy0"], min_level=1, max_level=3),
+                                       "high": dict(enemies["enemy0"], min_level=10, max_level=12)})
+    assert gap.enemies_for_level(7) == ("low",)
+    assert gap.enemies_for_level(20) == ("high",)
+
+# ============================================================================
+# CLOSED-FORM RESOLUTION TESTS
+# ============================================================================
+
+def test_resolve_battle_matches_turn_loop(capsys):
+    """Test that the closed form matches the turn-by-turn battle exactly"""
+    rng = random.Random(163)
+    for _ in range(2000):
+        character, enemy = random_matchup(rng)
+        outcome = combat_system.resolve_battle(character, enemy)
+        result, turns = play_logged_battle(character, enemy, capsys)
+
+        assert result == ("VICTORY" if outcome['winner'] == "player" else "DEFEAT")
+        assert turns == outcome['turns']
+        assert character['health'] == outcome['character_health']
+        assert enemy['health'] == outcome['enemy_health']
+
+def test_unlogged_battle_uses_fast_path(capsys):
+    """Test that log=False resolves silently with the same result"""
+    char = character_manager.create_character("Quiet", "Warrior")
+    battle = combat_system.SimpleBattle(char, combat_system.create_enemy("orc"), log=False)
+
+    assert battle.start_battle() == "VICTORY"
+    assert capsys.readouterr().out == ""
+    assert battle.turns == 7 and char['health'] == 66
+    assert battle.combat_active == False
+
+def test_hits_to_kill_matches_resolver():
+    """Test that the winner's hits to kill equal the resolved turn count"""
+    rng = random.Random(24)
+    for _ in range(500):
+        character, enemy = random_matchup(rng)
+        outcome = combat_system.resolve_battle(character, enemy)
+        if outcome['winner'] == "player":
+            assert combat_system.hits_to_kill(character, enemy) == outcome['turns']
+        else:
+            assert combat_system.hits_to_kill(enemy, character) == outcome['turns']
+
+def test_resolve_battle_rejects_dead_character():
+    """Test that a dead character cannot be resolved into a battle"""
+    with pytest.raises(CharacterDeadError):
+        combat_system.resolve_battle({"health": 0, "strength": 10}, combat_system.create_enemy("goblin"))
+
+# ============================================================================
+# BATTLE LOG SINK TESTS
+# ============================================================================
+
+def test_stdout_sink_keeps_original_output(capsys):
+    """Test that the default sink prints the same lines as before"""
+    char = {"name": "Hero", "health": 10, "strength": 1}
+    combat_system.SimpleBattle(char, combat_system.create_enemy("goblin")).start_battle()
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == ">>> Hero attacks Goblin for 1 damage"
+    assert lines[1] == ">>> Goblin attacks Hero for 8 damage"
+    assert lines[-1] == ">>> You were defeated by the Goblin..."
+
+def test_event_and_ring_buffer_sinks(capsys):
+    """Test structured events and bounded message capture"""
+    events = combat_system.EventListSink()
+    ring = combat_system.RingBufferSink(capacity=3)
+    for sink in (events, ring):
+        char = character_manager.create_character("Logger", "Mage")
+        assert combat_system.SimpleBattle(char, combat_system.create_enemy("goblin"), log=sink).start_battle() == "VICTORY"
+
+    assert capsys.readouterr().out == ""
+    assert events.events[0] == {"event": "attack", "attacker": "Logger", "target": "Goblin", "damage": 6}
+    assert list(ring.messages) == events.messages()[-3:]
+
+def test_null_sink_skips_formatting():
+    """Test that a disabled sink is never called and the battle is resolved"""
+    class ExplodingSink(combat_system.NullSink):
+        def log(self, event, **fields):
+            raise AssertionError("disabled sink was called")
+
+    char = character_manager.create_character("Silent", "Rogue")
+    battle = combat_system.SimpleBattle(char, combat_system.create_enemy("goblin"), log=ExplodingSink())
+    assert battle.start_battle() == "VICTORY"
+    battle.combat_active = True
+    battle.player_turn()
+
+def test_sink_without_log_fails_on_construction():
+    """Test that an incomplete sink is rejected before any battle"""
+    class IncompleteSink(combat_system.BattleLogSink):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteSink()
+    with pytest.raises(TypeError):
+        combat_system.BattleLogSink()
+
+# ============================================================================
+# BATCH SIMULATION TESTS
+# ============================================================================
+
+def random_stat_columns(rng, count):
+    return (
+        [rng.randint(0, 60) for _ in range(count)],
+        [rng.randint(-2, 400) for _ in range(count)],
+        [rng.randint(0, 80) for _ in range(count)],
+        [rng.randint(-5, 400) for _ in range(count)],
+    )
+
+@pytest.mark.parametrize("use_numpy", [False, pytest.param(True, marks=pytest.mark.skipif(
+    combat_system.np is None, reason="NumPy is not installed"))])
+def test_simulate_battles_matches_resolver(use_numpy):
+    """Test every simulated battle against resolve_battle"""
+    columns = random_stat_columns(random.Random(7), 3000)
+    results = combat_system.simulate_battles(*columns, use_numpy=use_numpy)
+    assert results['numpy'] == use_numpy
+
+    for i, (strength, health, enemy_strength, enemy_health) in enumerate(zip(*columns)):
+        if health <= 0:
+            expected = (False, 0, health, enemy_health)
+        else:
+            outcome = combat_system.resolve_battle(
+                {"health": health, "strength": strength}, {"health": enemy_health, "strength": enemy_strength}
+            )
+            expected = (outcome['winner'] == "player", outcome['turns'],
+                        outcome['character_health'], outcome['enemy_health'])
+        actual = (bool(results['player_wins'][i]), int(results['turns'][i]),
+                  int(results['character_health'][i]), int(results['enemy_health'][i]))
+        assert actual == expected
+
+def test_simulate_battles_broadcasts_scalars():
+    """Test one enemy against many characters in both implementations"""
+    dragon = combat_system.create_enemy("dragon")
+    strengths = [10, 20, 40]
+    healths = [100, 300, 500]
+
+    python_results = combat_system.simulate_battles(strengths, healths, dragon['strength'], dragon['health'],
+                                                    use_numpy=False)
+    assert python_results['player_wins'] == [False, True, True]
+    if combat_system.np is not None:
+        numpy_results = combat_system.simulate_battles(strengths, healths, dragon['strength'], dragon['health'])
+        assert numpy_results['turns'].tolist() == list(python_results['turns'])
+
+    with pytest.raises(ValueError):
+        combat_system.simulate_battles([1, 2], [10], 5, 5, use_numpy=False)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
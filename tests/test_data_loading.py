@@ -0,0 +1,371 @@
+"""
+Test Data Loading
+Tests the game_data loading pipeline (caching, parsing, catalogs)
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import game_data
+
+SAMPLE_ITEMS = """ITEM_ID: health_potion
+NAME: Health Potion
+TYPE: consumable
+EFFECT: health:20
+COST: 25
+DESCRIPTION: Restores 20 health points
+
+ITEM_ID: iron_sword
+NAME: Iron Sword
+TYPE: weapon
+EFFECT: strength:5
+COST: 100
+DESCRIPTION: A sturdy iron sword
+"""
+
+def write_file(path, content):
+    with open(path, "w") as f:
+        f.write(content)
+    return str(path)
+
+# ============================================================================
+# COMPILED CACHE TESTS
+# ============================================================================
+
+def test_cache_sidecar_is_created_and_reused(tmp_path):
+    """Test that loading writes a cache sidecar and reloads the same data"""
+    items_file = write_file(tmp_path / "items.txt", SAMPLE_ITEMS)
+
+    items = game_data.load_items(items_file)
+    assert os.path.exists(items_file + game_data.CACHE_SUFFIX)
+
+    cached = game_data.load_items(items_file)
+    assert cached == items
+    assert cached == game_data.load_items(items_file, use_cache=False)
+
+def test_cache_rebuilds_when_file_changes(tmp_path):
+    """Test that a stale cache is rebuilt after the data file is edited"""
+    items_file = write_file(tmp_path / "items.txt", SAMPLE_ITEMS)
+    game_data.load_items(items_file)
+
+    write_file(items_file, SAMPLE_ITEMS.replace("COST: 25", "COST: 30"))
+
+    items = game_data.load_items(items_file)
+    assert items['health_potion']['cost'] == 30
+
+def test_corrupt_cache_is_ignored(tmp_path):
+    """Test that a garbled cache sidecar falls back to parsing"""
+    items_file = write_file(tmp_path / "items.txt", SAMPLE_ITEMS)
+    write_file(items_file + game_data.CACHE_SUFFIX, "not a cache")
+
+    items = game_data.load_items(items_file)
+    assert set(items) == {'health_potion', 'iron_sword'}
+
+# ============================================================================
+# STREAMING READER TESTS
+# ============================================================================
+
+def test_iter_items_yields_records_lazily(tmp_path):
+    """Test that iter_items streams validated items one block at a time"""
+    items_file = write_file(tmp_path / "items.txt", "\n\n\n" + SAMPLE_ITEMS + "\n\n")
+
+    stream = game_data.iter_items(items_file)
+    first = next(stream)
+    assert first['item_id'] == 'health_potion'
+    assert first['cost'] == 25
+    assert [item['item_id'] for item in stream] == ['iron_sword']
+
+def test_iter_quests_missing_file():
+    """Test that the streaming reader raises MissingDataFileError"""
+    with pytest.raises(MissingDataFileError):
+        list(game_data.iter_quests("nonexistent_file.txt"))
+
+# ============================================================================
+# LAZY CATALOG TESTS
+# ============================================================================
+
+def test_lazy_catalog_matches_eager_load(tmp_path):
+    """Test that the lazy catalog returns the same items as load_items"""
+    items_file = write_file(tmp_path / "items.txt", SAMPLE_ITEMS)
+    eager = game_data.load_items(items_file, use_cache=False)
+
+    with game_data.load_items(items_file, lazy=True) as catalog:
+        assert len(catalog) == 2
+        assert 'iron_sword' in catalog
+        assert 'missing' not in catalog
+        assert catalog.get('missing') is None
+        assert catalog['iron_sword'] == eager['iron_sword']
+        assert dict(catalog.items()) == eager
+
+def test_lazy_catalog_defers_validation(tmp_path):
+    """Test that a bad block only raises when that item is accessed"""
+    bad_items = SAMPLE_ITEMS.replace("COST: 100", "COST: lots")
+    items_file = write_file(tmp_path / "items.txt", bad_items)
+
+    with game_data.load_items(items_file, lazy=True) as catalog:
+        assert catalog['health_potion']['cost'] == 25
+        with pytest.raises(InvalidDataFormatError):
+            catalog['iron_sword']
+
+# ============================================================================
+# SHARDED DIRECTORY TESTS
+# ============================================================================
+
+def test_item_shards_are_merged(tmp_path):
+    """Test that a directory of item shards loads into one dictionary"""
+    first, second = SAMPLE_ITEMS.split("\n\n")
+    write_file(tmp_path / "01_potions.txt", first)
+    write_file(tmp_path / "02_weapons.txt", second)
+    write_file(tmp_path / "README.md", "not a shard")
+
+    items = game_data.load_item_shards(str(tmp_path), max_workers=2)
+    assert items == game_data.load_items(write_file(tmp_path / "all.dat", SAMPLE_ITEMS))
+
+def test_duplicate_ids_across_shards(tmp_path):
+    """Test that the same ID in two shards raises InvalidDataFormatError"""
+    write_file(tmp_path / "a.txt", SAMPLE_ITEMS)
+    write_file(tmp_path / "b.txt", SAMPLE_ITEMS)
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_item_shards(str(tmp_path), max_workers=1)
+
+def test_missing_shard_directory():
+    """Test that a missing shard directory raises MissingDataFileError"""
+    with pytest.raises(MissingDataFileError):
+        game_data.load_quest_shards("nonexistent_dir.d")
+
+# ============================================================================
+# HOT RELOAD TESTS
+# ============================================================================
+
+def test_reloader_applies_block_diff(tmp_path):
+    """Test that poll() reports and applies added, changed and removed items"""
+    quests_file = write_file(tmp_path / "quests.txt", "")
+    items_file = write_file(tmp_path / "items.txt", SAMPLE_ITEMS)
+
+    reloader = game_data.DataReloader(quests_file, items_file)
+    quests, items = reloader.load()
+    original_potion = items['health_potion']
+
+    assert reloader.poll(quests, items)['items'] == {'added': [], 'changed': [], 'removed': []}
+
+    potion, sword = SAMPLE_ITEMS.split("\n\n")
+    shield = sword.replace("iron_sword", "shield").replace("weapon", "armor")
+    write_file(items_file, potion + "\n\n" + shield.replace("COST: 100", "COST: 80"))
+    os.utime(items_file, ns=(0, 0))
+
+    diff = reloader.poll(quests, items)['items']
+    assert diff == {'added': ['shield'], 'changed': [], 'removed': ['iron_sword']}
+    assert items['health_potion'] is original_potion
+    assert items['shield']['cost'] == 80
+    assert 'iron_sword' not in items
+
+def test_reloader_keeps_data_on_bad_edit(tmp_path):
+    """Test that a bad edit raises and leaves the loaded data untouched"""
+    quests_file = write_file(tmp_path / "quests.txt", "")
+    items_file = write_file(tmp_path / "items.txt", SAMPLE_ITEMS)
+
+    reloader = game_data.DataReloader(quests_file, items_file)
+    quests, items = reloader.load()
+    write_file(items_file, SAMPLE_ITEMS.replace("COST: 25", "COST: cheap"))
+    os.utime(items_file, ns=(0, 0))
+
+    with pytest.raises(InvalidDataFormatError):
+        reloader.poll(quests, items)
+    assert items['health_potion']['cost'] == 25
+
+# ============================================================================
+# ITEM CATALOG TESTS
+# ============================================================================
+
+def test_item_catalog_indexes():
+    """Test the type, effect stat and cost range queries"""
+    catalog = game_data.load_item_catalog("data/items.txt")
+    items = game_data.load_items("data/items.txt")
+
+    assert dict(catalog) == items
+
+    weapons = catalog.get_items_by_type('weapon')
+    assert {item['item_id'] for item in weapons} == {'iron_sword', 'steel_sword', 'fire_staff'}
+
+    magic_items = catalog.get_items_by_stat('magic')
+    assert {item['item_id'] for item in magic_items} == {'fire_staff', 'magic_robe', 'wisdom_elixir'}
+
+    cheap_weapons = catalog.get_items_in_cost_range(max_cost=200, item_type='weapon')
+    assert [item['item_id'] for item in cheap_weapons] == ['iron_sword', 'fire_staff']
+
+    costs = [item['cost'] for item in catalog.get_items_in_cost_range(50, 150)]
+    assert costs == sorted(costs)
+    assert min(costs) >= 50 and max(costs) <= 150
+
+def test_item_catalog_updates_indexes():
+    """Test that replacing and removing items keeps the indexes in sync"""
+    catalog = game_data.ItemCatalog({
+        'club': {'item_id': 'club', 'type': 'weapon', 'effect': 'strength:2', 'cost': 10}
+    })
+    catalog['club'] = {'item_id': 'club', 'type': 'armor', 'effect': 'max_health:5', 'cost': 40}
+
+    assert catalog.get_items_by_type('weapon') == []
+    assert catalog.get_items_by_stat('max_health')[0]['cost'] == 40
+    assert catalog.get_items_in_cost_range(max_cost=20) == []
+
+    del catalog['club']
+    assert len(catalog) == 0
+    assert catalog.get_items_in_cost_range() == []
+    assert catalog.get_item_types() == []
+
+# ============================================================================
+# RECORD SCHEMA TESTS
+# ============================================================================
+
+def test_schema_error_messages_match_validators():
+    """Test that single-pass loading reports the same errors as validation"""
+    block = SAMPLE_ITEMS.split("\n\n")[0].splitlines()
+
+    bad_type = [line.replace("consumable", "gem") for line in block]
+    with pytest.raises(InvalidDataFormatError, match="Item type 'gem' is invalid"):
+        game_data.ITEM_SCHEMA.load_block(bad_type)
+    with pytest.raises(InvalidDataFormatError, match="Item type 'gem' is invalid"):
+        game_data.validate_item_data(game_data.parse_item_block(bad_type))
+
+    negative_cost = [line.replace("COST: 25", "COST: -5") for line in block]
+    with pytest.raises(InvalidDataFormatError, match="Item cost must be a non-negative integer"):
+        game_data.ITEM_SCHEMA.load_block(negative_cost)
+
+    with pytest.raises(InvalidDataFormatError, match="missing required field: NAME"):
+        game_data.ITEM_SCHEMA.load_block(block[:1] + block[2:])
+
+def test_custom_record_schema(tmp_path):
+    """Test that new record types can be described with a RecordSchema"""
+    class_schema = game_data.RecordSchema("Class", [
+        ('CLASS_ID', 'class_id', str),
+        ('HEALTH', 'health', int),
+        ('ROLE', 'role', str)
+    ], choices={'role': ['tank', 'caster']}, plural="Classes")
+    classes_file = write_file(tmp_path / "classes.txt",
+                              "CLASS_ID: warrior\nHEALTH: 120\nROLE: tank\n")
+
+    classes = game_data.load_records(classes_file, class_schema)
+    assert classes == {'warrior': {'class_id': 'warrior', 'health': 120, 'role': 'tank'}}
+
+    write_file(classes_file, "CLASS_ID: bard\nHEALTH: 90\nROLE: singer\n")
+    with pytest.raises(InvalidDataFormatError, match="Classes file format error: Class role"):
+        game_data.load_records(classes_file, class_schema)
+
+def test_enemy_data_loading_and_validation(tmp_path):
+    """Test loading enemies and rejecting bad level ranges"""
+    enemies_file = write_file(tmp_path / "enemies.txt", game_data.DEFAULT_ENEMIES_DATA)
+
+    enemies = game_data.load_enemies(enemies_file)
+    assert list(enemies) == ["goblin", "orc", "dragon", "skeleton"]
+    assert enemies["dragon"]["max_level"] == 0
+    assert enemies == game_data.load_default_enemies()
+
+    write_file(enemies_file, game_data.DEFAULT_ENEMIES_DATA.replace("MAX_LEVEL: 5", "MAX_LEVEL: 2"))
+    with pytest.raises(InvalidDataFormatError, match="Enemy 'orc' MAX_LEVEL"):
+        game_data.load_enemies(enemies_file)
+    write_file(enemies_file, game_data.DEFAULT_ENEMIES_DATA.replace("SPAWNS: no", "SPAWNS: maybe"))
+    with pytest.raises(InvalidDataFormatError, match="Enemies file format error: Enemy spawns"):
+        game_data.load_enemies(enemies_file)
+
+# ============================================================================
+# SYNTHETIC CONTENT TESTS
+# ============================================================================
+
+def test_synthetic_data_files_load(tmp_path):
+    """Test that generated files load and form a valid prerequisite DAG"""
+    import quest_handler
+
+    quests_file, items_file = game_data.generate_synthetic_data_files(300, 200, str(tmp_path), seed=7)
+    quests = game_data.load_quests(quests_file)
+    items = game_data.load_items(items_file)
+
+    assert len(quests) == 300 and len(items) == 200
+    assert quest_handler.validate_quest_prerequisites(quests)
+    for quest_id, quest in quests.items():
+        prereq = quest['prerequisite']
+        if prereq != 'NONE':
+            # Prerequisites always point backwards, so there are no cycles
+            assert int(prereq.split('_')[1]) < int(quest_id.split('_')[1])
+            assert quest['required_level'] >= quests[prereq]['required_level']
+    assert {item['type'] for item in items.values()} == {'weapon', 'armor', 'consumable'}
+
+# ============================================================================
+# COMPACT RECORD TESTS
+# ============================================================================
+
+def test_compact_records_support_dict_access():
+    """Test that compact records behave like the loaded dicts"""
+    items = game_data.load_items("data/items.txt")
+    compact_items = game_data.load_items("data/items.txt", compact=True)
+    quests = game_data.load_quests("data/quests.txt", compact=True)
+
+    sword = compact_items['iron_sword']
+    assert isinstance(sword, game_data.ItemRecord)
+    assert sword == items['iron_sword']
+    assert sword['cost'] == 100 and sword.get('type') == 'weapon'
+    assert sword.get('missing', 'default') == 'default'
+    assert (sword.effect_stat, sword.effect_value) == ('strength', 5)
+    assert dict(sword) == items['iron_sword']
+    assert quests['goblin_hunter'].get('prerequisite') == 'first_steps'
+
+    with pytest.raises(KeyError):
+        sword['missing']
+    with pytest.raises(AttributeError):
+        sword.cost = 1
+
+def test_compact_records_work_with_game_modules():
+    """Test that quest_handler and inventory_system accept compact records"""
+    import character_manager
+    import inventory_system
+    import quest_handler
+
+    items = game_data.load_items("data/items.txt", compact=True)
+    quests = game_data.load_quests("data/quests.txt", compact=True)
+    char = character_manager.create_character("CompactTest", "Warrior")
+
+    quest_handler.accept_quest(char, 'first_steps', quests)
+    quest_handler.complete_quest(char, 'first_steps', quests)
+    inventory_system.purchase_item(char, 'iron_sword', items['iron_sword'])
+    inventory_system.equip_weapon(char, 'iron_sword', items['iron_sword'])
+    assert char['strength'] == 20
+
+# ============================================================================
+# COLUMNAR ANALYTICS TESTS
+# ============================================================================
+
+def column_modes():
+    return [False, True] if game_data.np is not None else [False]
+
+def test_quest_column_aggregates():
+    """Test XP per level band and gold/XP ratios over quest columns"""
+    quests = game_data.load_quests("data/quests.txt")
+
+    for use_numpy in column_modes():
+        columns = game_data.build_quest_columns(quests, use_numpy=use_numpy)
+        assert list(columns['reward_xp']) == [q['reward_xp'] for q in quests.values()]
+
+        bands = game_data.total_reward_xp_by_level_band(columns, band_size=5)
+        assert bands == {(1, 5): 575, (6, 10): 1500}
+
+        ratios = list(game_data.gold_to_xp_ratios(columns))
+        assert ratios[columns['ids'].index('first_steps')] == 0.5
+
+def test_item_cost_histogram():
+    """Test the per-type cost histogram over item columns"""
+    items = game_data.load_items("data/items.txt")
+
+    for use_numpy in column_modes():
+        columns = game_data.build_item_columns(items, use_numpy=use_numpy)
+        histogram = game_data.cost_histogram_by_type(columns, bin_width=100)
+
+        assert histogram['weapon'] == {100: 1, 200: 2}
+        assert sum(histogram['consumable'].values()) == 4
+        assert sum(columns['effect_value']) == 20 + 50 + 5 + 10 + 8 + 10 + 25 + 5 + 3 + 3
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
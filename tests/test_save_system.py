@@ -0,0 +1,517 @@
+"""
+Test Save System
+Tests character persistence (atomic writes, batching, caching, backends)
+"""
+
+import pytest
+import sys
+import os
+import json
+import stat
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+
+# ============================================================================
+# ATOMIC SAVE TESTS
+# ============================================================================
+
+def test_atomic_save_leaves_no_temp_files(tmp_path):
+    """Test that saving writes only the final save file"""
+    char = character_manager.create_character("AtomicTest", "Warrior")
+
+    assert character_manager.save_character(char, str(tmp_path)) == True
+    assert os.listdir(tmp_path) == ["AtomicTest_save.json"]
+    assert character_manager.load_character("AtomicTest", str(tmp_path))['class'] == "Warrior"
+
+def test_failed_save_keeps_previous_file(tmp_path, monkeypatch):
+    """Test that a crash before the rename leaves the old save intact"""
+    char = character_manager.create_character("CrashTest", "Mage")
+    character_manager.save_character(char, str(tmp_path))
+
+    def crash(*args):
+        raise OSError("simulated crash")
+
+    char['gold'] = 999
+    monkeypatch.setattr(os, "replace", crash)
+    with pytest.raises(OSError):
+        character_manager.save_character(char, str(tmp_path))
+    monkeypatch.undo()
+
+    assert os.listdir(tmp_path) == ["CrashTest_save.json"]
+    assert character_manager.load_character("CrashTest", str(tmp_path))['gold'] == 100
+
+def test_saves_keep_file_permissions(tmp_path):
+    """Test that atomic saves get the default mode or keep the existing one"""
+    char = character_manager.create_character("ModeTest", "Rogue")
+    save_path = os.path.join(str(tmp_path), "ModeTest_save.json")
+
+    character_manager.save_character(char, str(tmp_path))
+    assert stat.S_IMODE(os.stat(save_path).st_mode) == character_manager._NEW_FILE_MODE
+
+    os.chmod(save_path, 0o640)
+    character_manager.save_character(char, str(tmp_path), force=True)
+    assert stat.S_IMODE(os.stat(save_path).st_mode) == 0o640
+
+def test_group_commit_concurrent_saves(tmp_path, monkeypatch):
+    """Test that concurrent group-commit saves all land and share syncs"""
+    save_dir = str(tmp_path)
+    # A slow directory fsync makes the other savers queue up behind the leader
+    real_fsync_directory = character_manager._fsync_directory
+
+    def slow_fsync_directory(directory):
+        time.sleep(0.05)
+        real_fsync_directory(directory)
+
+    monkeypatch.setattr(character_manager, "_fsync_directory", slow_fsync_directory)
+    characters = [character_manager.create_character(f"Group{i}", "Rogue") for i in range(16)]
+    threads = [
+        threading.Thread(target=character_manager.save_character, args=(char, save_dir, True))
+        for char in characters
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    committer = character_manager.get_group_committer(save_dir)
+    assert committer.commits == 16
+    assert 1 <= committer.syncs < committer.commits
+    assert sorted(os.listdir(save_dir)) == sorted(f"{c['name']}_save.json" for c in characters)
+
+# ============================================================================
+# WRITE-BEHIND SAVER TESTS
+# ============================================================================
+
+def test_write_behind_coalesces_and_flushes(tmp_path):
+    """Test that repeated submits coalesce into one save on flush"""
+    saver = character_manager.WriteBehindSaver(str(tmp_path), interval=60)
+    char = character_manager.create_character("BehindTest", "Cleric")
+
+    for gold in range(5):
+        char['gold'] = gold
+        saver.submit(char)
+    char['inventory'].append("unsaved_item")  # Changed after the last submit
+
+    assert saver.flush() == []
+    assert saver.saves == 1
+    loaded = character_manager.load_character("BehindTest", str(tmp_path))
+    assert loaded['gold'] == 4
+    assert loaded['inventory'] == []
+
+    saver.close()
+    with pytest.raises(RuntimeError):
+        saver.submit(char)
+
+def test_write_behind_background_flush(tmp_path):
+    """Test that the worker thread saves on its interval and on close"""
+    saver = character_manager.WriteBehindSaver(str(tmp_path), interval=0.01)
+    saver.submit(character_manager.create_character("Background", "Rogue"))
+    saver.close()
+
+    assert saver.pending_count() == 0
+    assert os.path.exists(os.path.join(tmp_path, "Background_save.json"))
+
+def test_write_behind_reports_errors(tmp_path):
+    """Test that failed background saves are reported by flush()"""
+    saver = character_manager.WriteBehindSaver(str(tmp_path), interval=60)
+    char = character_manager.create_character("BadSave", "Mage").to_dict()
+    char['level'] = "one"
+
+    saver.submit(char)
+    errors = saver.close()
+    assert [name for name, _ in errors] == ["BadSave"]
+    assert isinstance(errors[0][1], InvalidSaveDataError)
+
+# ============================================================================
+# DIRTY TRACKING TESTS
+# ============================================================================
+
+def test_unchanged_character_is_not_rewritten(tmp_path):
+    """Test that saving an unchanged character skips the write"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("DirtyTest", "Warrior")
+
+    assert character_manager.save_character(char, save_dir) == True
+    assert character_manager.save_character(char, save_dir) == False
+    assert character_manager.save_character(char, save_dir, force=True) == True
+
+    char['inventory'].append("health_potion")
+    assert character_manager.save_character(char, save_dir) == True
+    assert character_manager.load_character("DirtyTest", save_dir)['inventory'] == ["health_potion"]
+
+def test_delete_resets_dirty_tracking(tmp_path):
+    """Test that a deleted save is written again even if unchanged"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("DeletedTest", "Mage")
+
+    character_manager.save_character(char, save_dir)
+    character_manager.delete_character("DeletedTest", save_dir)
+    assert character_manager.save_character(char, save_dir) == True
+    assert os.path.exists(os.path.join(save_dir, "DeletedTest_save.json"))
+
+def test_file_removed_outside_api_is_rewritten(tmp_path):
+    """Test that an unchanged character is saved again if its file was removed or replaced"""
+    save_dir = str(tmp_path)
+    save_path = os.path.join(save_dir, "RemovedTest_save.json")
+    char = character_manager.create_character("RemovedTest", "Cleric")
+
+    character_manager.save_character(char, save_dir)
+    os.remove(save_path)
+    assert character_manager.save_character(char, save_dir) == True
+    assert os.path.exists(save_path)
+
+    with open(save_path, "w") as f:
+        f.write("{}")
+    assert character_manager.save_character(char, save_dir) == True
+    character_manager.clear_character_cache()
+    assert character_manager.load_character("RemovedTest", save_dir) == char
+
+def test_invalid_character_still_rejected(tmp_path):
+    """Test that changed invalid data is still validated before writing"""
+    char = character_manager.create_character("InvalidTest", "Rogue").to_dict()
+    char['gold'] = "lots"
+
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.save_character(char, str(tmp_path))
+    assert os.listdir(tmp_path) == []
+
+# ============================================================================
+# SAVE FORMAT TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("save_format", character_manager.SAVE_FORMATS)
+def test_save_formats_round_trip(tmp_path, save_format):
+    """Test that every save format loads back identically"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("Formatted", "Cleric")
+    char['inventory'] = ["health_potion", "iron_sword", "ünïcode_relic"]
+    char['gold'] = -5 if save_format == "binary" else 5000
+
+    character_manager.save_character(char, save_dir, save_format=save_format)
+    character_manager.clear_character_cache()
+    assert character_manager.load_character("Formatted", save_dir) == char
+
+def test_save_format_header_and_legacy_json(tmp_path):
+    """Test that headered formats are tagged and plain JSON still loads"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("Legacy", "Warrior")
+    with open(os.path.join(save_dir, "Legacy_save.json"), "w") as f:
+        json.dump(char.to_dict(), f, indent=4)
+    assert character_manager.load_character("Legacy", save_dir) == char
+
+    character_manager.save_character(char, save_dir, save_format="lzma")
+    with open(os.path.join(save_dir, "Legacy_save.json"), "rb") as f:
+        assert f.read(len(character_manager.SAVE_MAGIC)) == character_manager.SAVE_MAGIC
+
+    with pytest.raises(ValueError):
+        character_manager.save_character(char, save_dir, save_format="yaml")
+
+def test_corrupted_binary_save_is_reported(tmp_path):
+    """Test that a damaged compressed or binary save raises SaveFileCorruptedError"""
+    save_dir = str(tmp_path)
+    for save_format in ("zlib", "binary"):
+        character_manager.save_character(
+            character_manager.create_character("Damaged", "Rogue"), save_dir, force=True, save_format=save_format
+        )
+        path = os.path.join(save_dir, "Damaged_save.json")
+        with open(path, "rb") as f:
+            raw = f.read()
+        with open(path, "wb") as f:
+            f.write(raw[:len(raw) // 2])
+        with pytest.raises(SaveFileCorruptedError):
+            character_manager.load_character("Damaged", save_dir)
+
+# ============================================================================
+# LOAD CACHE TESTS
+# ============================================================================
+
+def test_load_cache_hits_and_returns_copies(tmp_path):
+    """Test that repeated loads hit the cache and cannot corrupt it"""
+    save_dir = str(tmp_path)
+    cache = character_manager.CharacterCache(max_entries=8)
+    character_manager._character_cache, original = cache, character_manager._character_cache
+    try:
+        character_manager.save_character(character_manager.create_character("CacheHero", "Mage"), save_dir)
+        first = character_manager.load_character("CacheHero", save_dir)
+        first['inventory'].append("mutated")
+        second = character_manager.load_character("CacheHero", save_dir)
+
+        assert second['inventory'] == []
+        assert cache.hits == 2 and cache.misses == 0
+    finally:
+        character_manager._character_cache = original
+
+def test_load_returns_character_from_cache_and_disk(tmp_path):
+    """Test that the load result type does not depend on the cache"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("DictHero", "Warrior").to_dict()
+    character_manager.save_character(char, save_dir)
+
+    cached = character_manager.load_character("DictHero", save_dir)
+    character_manager.clear_character_cache()
+    loaded = character_manager.load_character("DictHero", save_dir)
+
+    assert type(cached) is type(loaded) is character_manager.Character
+    assert cached == loaded == char
+
+def test_load_cache_sees_external_changes(tmp_path):
+    """Test that a file rewritten outside save_character is reloaded"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("Edited", "Rogue")
+    character_manager.save_character(char, save_dir)
+    character_manager.load_character("Edited", save_dir)
+
+    char['gold'] = 12345
+    with open(os.path.join(save_dir, "Edited_save.json"), "w") as f:
+        json.dump(char.to_dict(), f)
+    assert character_manager.load_character("Edited", save_dir)['gold'] == 12345
+
+    character_manager.delete_character("Edited", save_dir)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Edited", save_dir)
+
+def test_load_cache_evicts_least_recently_used(tmp_path):
+    """Test that the cache stays within its bound"""
+    cache = character_manager.CharacterCache(max_entries=2)
+    for name in ["A", "B", "C"]:
+        path = str(tmp_path / f"{name}_save.json")
+        with open(path, "w") as f:
+            f.write("{}")
+        cache.put(path, {'name': name})
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.get(str(tmp_path / "A_save.json")) is None
+    assert cache.get(str(tmp_path / "C_save.json")) == {'name': "C"}
+
+# ============================================================================
+# BULK LOAD AND SAVE TESTS
+# ============================================================================
+
+def test_bulk_save_and_load(tmp_path):
+    """Test that bulk saves land and bulk loads return every character"""
+    save_dir = str(tmp_path)
+    characters = [character_manager.create_character(f"Bulk{i}", "Mage") for i in range(20)]
+
+    saved, errors = character_manager.save_characters(characters, save_dir, max_workers=4)
+    assert errors == {}
+    assert saved == {c['name']: True for c in characters}
+
+    loaded, errors = character_manager.load_characters([c['name'] for c in characters], save_dir, max_workers=4)
+    assert errors == {}
+    assert loaded == {c['name']: c for c in characters}
+
+def test_bulk_operations_report_errors(tmp_path):
+    """Test that failures are collected per character without aborting"""
+    save_dir = str(tmp_path)
+    good = character_manager.create_character("Good", "Rogue")
+    bad = character_manager.create_character("Bad", "Rogue").to_dict()
+    bad['level'] = "high"
+
+    saved, errors = character_manager.save_characters([good, bad], save_dir)
+    assert saved == {"Good": True}
+    assert isinstance(errors["Bad"], InvalidSaveDataError)
+
+    with open(os.path.join(save_dir, "Corrupt_save.json"), "w") as f:
+        f.write("{ not json")
+    loaded, errors = character_manager.load_characters(["Good", "Missing", "Corrupt"], save_dir)
+    assert list(loaded) == ["Good"]
+    assert isinstance(errors["Missing"], CharacterNotFoundError)
+    assert isinstance(errors["Corrupt"], SaveFileCorruptedError)
+
+def test_bulk_save_to_sqlite(tmp_path):
+    """Test that bulk saves to a database commit together"""
+    db_path = str(tmp_path / "saves.db")
+    characters = [character_manager.create_character(f"SqlBulk{i}", "Cleric") for i in range(5)]
+
+    saved, errors = character_manager.save_characters(characters, db_path)
+    assert errors == {} and len(saved) == 5
+    loaded, errors = character_manager.load_characters(["SqlBulk3", "Nobody"], db_path)
+    assert loaded["SqlBulk3"]['class'] == "Cleric"
+    assert isinstance(errors["Nobody"], CharacterNotFoundError)
+
+# ============================================================================
+# SHARDED LAYOUT TESTS
+# ============================================================================
+
+def test_enable_sharded_layout_moves_saves(tmp_path):
+    """Test that flat saves move into shards and stay loadable"""
+    save_dir = str(tmp_path)
+    for name in ["Alpha", "Beta"]:
+        character_manager.save_character(character_manager.create_character(name, "Rogue"), save_dir)
+
+    assert character_manager.enable_sharded_layout(save_dir) == 2
+    assert sorted(os.listdir(save_dir)) == sorted(
+        ["manifest.log", character_manager._get_shard_name("Alpha"), character_manager._get_shard_name("Beta")]
+    )
+    assert sorted(character_manager.get_saved_characters(save_dir)) == ["Alpha", "Beta"]
+    assert character_manager.load_character("Beta", save_dir)['class'] == "Rogue"
+
+def test_sharded_save_and_delete_update_manifest(tmp_path):
+    """Test that saves and deletes are recorded in the manifest"""
+    save_dir = str(tmp_path)
+    character_manager.enable_sharded_layout(save_dir)
+    char = character_manager.create_character("Sharded", "Mage")
+
+    assert character_manager.save_character(char, save_dir) == True
+    shard_file = os.path.join(save_dir, character_manager._get_shard_name("Sharded"), "Sharded_save.json")
+    assert os.path.exists(shard_file)
+    assert character_manager.get_saved_characters(save_dir) == ["Sharded"]
+
+    assert character_manager.delete_character("Sharded", save_dir) == True
+    assert not os.path.exists(shard_file)
+    assert character_manager.get_saved_characters(save_dir) == []
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Sharded", save_dir)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("Sharded", save_dir)
+
+def test_manifest_sees_entries_from_other_writers(tmp_path):
+    """Test that lines appended by another process are picked up"""
+    save_dir = str(tmp_path)
+    character_manager.enable_sharded_layout(save_dir)
+    character_manager.save_character(character_manager.create_character("Local", "Cleric"), save_dir)
+
+    other = character_manager.SaveManifest(save_dir)
+    other.add("Remote")
+    other.remove("Local")
+    assert character_manager.get_saved_characters(save_dir) == ["Remote"]
+
+def test_check_save_manifest_repairs_drift(tmp_path):
+    """Test that the checker rebuilds a manifest that disagrees with disk"""
+    save_dir = str(tmp_path)
+    character_manager.enable_sharded_layout(save_dir)
+    for name in ["Kept", "Removed"]:
+        character_manager.save_character(character_manager.create_character(name, "Warrior"), save_dir)
+
+    os.remove(os.path.join(save_dir, character_manager._get_shard_name("Removed"), "Removed_save.json"))
+    character_manager.SaveManifest(save_dir).remove("Kept")
+
+    report = character_manager.check_save_manifest(save_dir)
+    assert report == {'missing': ["Kept"], 'stale': ["Removed"], 'rebuilt': True}
+    assert character_manager.get_saved_characters(save_dir) == ["Kept"]
+    assert character_manager.check_save_manifest(save_dir)['rebuilt'] == False
+
+def test_manifest_replays_rebuild_by_other_writer(tmp_path):
+    """Test that a reader replays a manifest rebuilt larger by someone else"""
+    save_dir = str(tmp_path)
+    writer = character_manager.SaveManifest(save_dir)
+    reader = character_manager.SaveManifest(save_dir)
+    for name in ["a", "b", "c"]:
+        writer.add(name)
+    assert reader.names() == ["a", "b", "c"]
+
+    rebuilt_names = ["a", "b"] + [f"longname_{i}" for i in range(20)]
+    writer.rebuild(rebuilt_names)
+    assert reader.names() == sorted(rebuilt_names)
+
+def test_flat_directory_notices_sharding_by_other_process(tmp_path):
+    """Test that a flat directory is re-checked for a manifest"""
+    save_dir = str(tmp_path)
+    assert character_manager._get_manifest(save_dir) is None
+
+    # Another process switches the directory to the sharded layout
+    character_manager.SaveManifest(save_dir).rebuild([])
+    character_manager.save_character(character_manager.create_character("Late", "Rogue"), save_dir)
+    assert os.path.exists(os.path.join(save_dir, character_manager._get_shard_name("Late"), "Late_save.json"))
+    assert character_manager.get_saved_characters(save_dir) == ["Late"]
+
+def test_flat_layout_checks_manifest_once_per_call(tmp_path, monkeypatch):
+    """Test that flat saves and loads look for the manifest only once"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("Flat", "Warrior")
+    checks = []
+    real_exists = os.path.exists
+
+    def counting_exists(path):
+        if str(path).endswith(character_manager.MANIFEST_FILENAME):
+            checks.append(path)
+        return real_exists(path)
+
+    monkeypatch.setattr(os.path, "exists", counting_exists)
+    character_manager.save_character(char, save_dir)
+    assert len(checks) == 1
+
+    character_manager.clear_character_cache()
+    checks.clear()
+    character_manager.load_character("Flat", save_dir)
+    assert len(checks) == 1
+
+# ============================================================================
+# SQLITE BACKEND TESTS
+# ============================================================================
+
+def test_sqlite_backend_round_trip(tmp_path):
+    """Test the save/load/list/delete API against a SQLite database"""
+    db_path = str(tmp_path / "saves.db")
+    char = character_manager.create_character("SqlHero", "Cleric")
+
+    assert character_manager.save_character(char, db_path) == True
+    assert character_manager.load_character("SqlHero", db_path) == char
+    assert character_manager.get_saved_characters(db_path) == ["SqlHero"]
+
+    assert character_manager.delete_character("SqlHero", db_path) == True
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("SqlHero", db_path)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("SqlHero", db_path)
+
+def test_sqlite_row_changed_outside_api_is_rewritten(tmp_path):
+    """Test that an unchanged character is saved again if its row was deleted or replaced"""
+    db_path = str(tmp_path / "saves.db")
+    char = character_manager.create_character("SqlDirty", "Mage")
+
+    assert character_manager.save_character(char, db_path) == True
+    assert character_manager.save_character(char, db_path) == False
+
+    character_manager.get_sqlite_store(db_path).delete("SqlDirty")
+    assert character_manager.save_character(char, db_path) == True
+    assert character_manager.get_saved_characters(db_path) == ["SqlDirty"]
+
+    character_manager.close_sqlite_stores()
+    os.remove(db_path)
+    assert character_manager.save_character(char, db_path) == True
+    assert character_manager.load_character("SqlDirty", db_path) == char
+
+def test_sqlite_batch_and_indexed_find(tmp_path):
+    """Test batched saves and lookups by class and level"""
+    db_path = str(tmp_path / "saves.db")
+    store = character_manager.get_sqlite_store(db_path)
+
+    with store.batch():
+        for i, char_class in enumerate(["Warrior", "Mage", "Warrior", "Rogue"]):
+            char = character_manager.create_character(f"Hero{i}", char_class)
+            char['level'] = i + 1
+            character_manager.save_character(char, db_path)
+
+    assert character_manager.find_characters(db_path, character_class="Warrior") == ["Hero2", "Hero0"]
+    assert character_manager.find_characters(db_path, min_level=2, max_level=3) == ["Hero2", "Hero1"]
+
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            character_manager.save_character(character_manager.create_character("Lost", "Mage"), db_path)
+            raise RuntimeError("abort batch")
+    assert "Lost" not in character_manager.get_saved_characters(db_path)
+
+def test_migrate_json_saves(tmp_path):
+    """Test importing JSON save files into a SQLite database"""
+    json_dir = str(tmp_path / "json")
+    db_path = str(tmp_path / "saves.sqlite")
+    for name in ["Alpha", "Beta"]:
+        character_manager.save_character(character_manager.create_character(name, "Rogue"), json_dir)
+    with open(os.path.join(json_dir, "Broken_save.json"), "w") as f:
+        f.write("{ not json")
+
+    migrated, errors = character_manager.migrate_json_saves(json_dir, db_path)
+
+    assert sorted(migrated) == ["Alpha", "Beta"]
+    assert isinstance(errors["Broken"], SaveFileCorruptedError)
+    assert character_manager.load_character("Beta", db_path)['class'] == "Rogue"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
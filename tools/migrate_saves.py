@@ -0,0 +1,36 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Migration Tool
+
+Imports every JSON save file from a save directory into a SQLite save
+database, which can then be used as the save_directory of the
+character_manager functions.
+
+Usage: python tools/migrate_saves.py [--from data/save_games] [--to data/save_games.db]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate JSON saves into a SQLite save database")
+    parser.add_argument("--from", dest="json_directory", default="data/save_games")
+    parser.add_argument("--to", dest="db_path", default="data/save_games.db")
+    args = parser.parse_args()
+
+    if not character_manager.is_sqlite_save_path(args.db_path):
+        parser.error(f"--to must end with one of: {', '.join(character_manager.SQLITE_SUFFIXES)}")
+
+    migrated, errors = character_manager.migrate_json_saves(args.json_directory, args.db_path)
+    print(f"Migrated {len(migrated)} characters into {args.db_path}")
+    for name, error in sorted(errors.items()):
+        print(f"  Skipped {name}: {error}")
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
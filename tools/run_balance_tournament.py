@@ -0,0 +1,51 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Balance Tournament Tool
+
+Runs every character class at every level against every enemy type on
+all cores and writes CSV/JSON balance reports.
+
+Usage: python tools/run_balance_tournament.py [--max-level 50] [--workers N]
+       [--chunk-size N] [--csv reports/balance.csv] [--json reports/balance.json]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import balance_tournament
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the class/level/enemy balance tournament")
+    parser.add_argument("--min-level", type=int, default=1)
+    parser.add_argument("--max-level", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None, help="default: one per CPU")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--csv", dest="csv_path", default="reports/balance.csv")
+    parser.add_argument("--json", dest="json_path", default="reports/balance.json")
+    args = parser.parse_args()
+
+    grid = balance_tournament.build_grid(levels=range(args.min_level, args.max_level + 1))
+    start = time.perf_counter()
+    rows = balance_tournament.run_tournament(grid, args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    for path in (args.csv_path, args.json_path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    balance_tournament.write_csv_report(rows, args.csv_path)
+    balance_tournament.write_json_report(rows, args.json_path)
+
+    print(f"Resolved {len(rows):,} matchups in {elapsed:.2f}s")
+    for character_class, by_enemy in balance_tournament.summarize_results(rows).items():
+        rates = ", ".join(f"{enemy} {stats['win_rate']:.0%}" for enemy, stats in by_enemy.items())
+        print(f"  {character_class:<8} {rates}")
+    print(f"Reports written to {args.csv_path} and {args.json_path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())